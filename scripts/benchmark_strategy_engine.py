@@ -0,0 +1,126 @@
+# scripts/benchmark_strategy_engine.py
+"""
+Micro-benchmark du moteur de stratégies du module Quant A.
+
+Compare l'implémentation pandas d'origine (reproduite ci-dessous comme référence) au
+cœur NumPy (strategy_core.py) et à ses wrappers pandas (strategy_engine.py) :
+latence par appel, pic mémoire (tracemalloc) et égalité bit à bit des résultats.
+
+Usage : python scripts/benchmark_strategy_engine.py [nombre_de_jours]
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.quant_a.strategy_engine import calculate_buy_and_hold, calculate_ma_crossover, calculate_metrics
+from src.quant_a.strategy_core import buy_and_hold_values, ma_crossover_values, performance_metrics
+
+SHORT_WINDOW = 50
+LONG_WINDOW = 200
+
+
+# --- Implémentation pandas d'origine (référence) ---
+
+def legacy_buy_and_hold(prices: pd.Series) -> pd.Series:
+    returns = prices.pct_change().fillna(0)
+    cumulative_value = (1 + returns).cumprod()
+    return cumulative_value / cumulative_value.iloc[0] * 100.0
+
+
+def legacy_ma_crossover(prices: pd.Series, short_window: int, long_window: int) -> pd.Series:
+    if prices.empty or len(prices) < long_window:
+        if not prices.empty:
+            return pd.Series([100.0], index=[prices.index[-1]])
+        else:
+            return pd.Series(dtype=float)
+    prices_df = pd.DataFrame({'Price': prices.values.ravel()}, index=prices.index)
+    prices_df['Short_MA'] = prices_df['Price'].rolling(window=short_window).mean()
+    prices_df['Long_MA'] = prices_df['Price'].rolling(window=long_window).mean()
+    prices_df['Signal'] = 0.0
+    # .iloc au lieu de l'affectation chaînée d'origine (sans effet avec le Copy-on-Write de pandas 3)
+    signal_column = prices_df.columns.get_loc('Signal')
+    prices_df.iloc[long_window:, signal_column] = np.where(
+        prices_df['Short_MA'][long_window:] > prices_df['Long_MA'][long_window:], 1.0, 0.0)
+    prices_df['Market_Returns'] = prices_df['Price'].pct_change()
+    prices_df['Strategy_Returns'] = prices_df['Signal'].shift(1).fillna(0) * prices_df['Market_Returns']
+    cumulative_value = (1 + prices_df['Strategy_Returns']).cumprod()
+    start_index = prices_df['Long_MA'].first_valid_index()
+    return cumulative_value / cumulative_value[start_index] * 100.0
+
+
+def legacy_metrics(returns: pd.Series, risk_free_rate=0.04) -> dict:
+    daily_returns = returns.pct_change().dropna()
+    cumulative_returns = (1 + daily_returns).cumprod()
+    drawdown = (cumulative_returns / cumulative_returns.cummax()) - 1
+    max_drawdown = drawdown.min().item()
+    avg_return = daily_returns.mean().item() * 252
+    volatility = float(daily_returns.std().item() * np.sqrt(252))
+    sharpe_ratio = 0.0 if volatility == 0 else float((avg_return - risk_free_rate) / volatility)
+    return {
+        "Max Drawdown": f"{max_drawdown * 100:.2f} %",
+        "Sharpe Ratio (Annuel)": f"{sharpe_ratio:.2f}"
+    }
+
+
+# --- Mesures ---
+
+def measure(label: str, func, repeat: int = 200) -> None:
+    """Affiche la latence médiane par appel et le pic mémoire d'un appel."""
+    timings = timeit.repeat(func, number=1, repeat=repeat)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<42} {np.median(timings) * 1e6:>10.1f} µs {peak / 1024:>10.1f} Kio")
+
+
+def main(n_days: int = 2520) -> None:
+    if n_days < LONG_WINDOW:
+        # Gestion d'erreur (Robustness) : la MA Crossover n'a pas de valeur sur un historique plus court
+        print(f"Erreur : le benchmark nécessite au moins {LONG_WINDOW} jours (fenêtre MA longue), reçu {n_days}.")
+        sys.exit(1)
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start='2015-01-01', periods=n_days)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n_days))), index=dates, name='Price')
+
+    # 1. Égalité bit à bit avec la référence pandas
+    bh_legacy, bh_new = legacy_buy_and_hold(prices), calculate_buy_and_hold(prices)
+    ma_legacy = legacy_ma_crossover(prices, SHORT_WINDOW, LONG_WINDOW)
+    ma_new = calculate_ma_crossover(prices, SHORT_WINDOW, LONG_WINDOW)
+    checks = {
+        "Buy-and-Hold": np.array_equal(bh_legacy.to_numpy(), bh_new.to_numpy(), equal_nan=True),
+        "MA Crossover": np.array_equal(ma_legacy.to_numpy(), ma_new.to_numpy(), equal_nan=True),
+        "Métriques B&H": legacy_metrics(bh_legacy) == calculate_metrics(bh_new),
+        "Métriques MA": legacy_metrics(ma_legacy) == calculate_metrics(ma_new),
+    }
+    print(f"--- Égalité bit à bit ({n_days} jours) ---")
+    for name, identical in checks.items():
+        print(f"{name:<20} {'OK' if identical else 'DIFFÉRENT'}")
+
+    # 2. Latence et pic mémoire
+    values = prices.to_numpy()
+    out = np.empty(n_days)
+    work = np.empty((3, n_days + 1))
+
+    print(f"\n--- Latence médiane / pic mémoire par appel ---")
+    measure("Buy-and-Hold (pandas d'origine)", lambda: legacy_buy_and_hold(prices))
+    measure("Buy-and-Hold (wrapper pandas)", lambda: calculate_buy_and_hold(prices))
+    measure("Buy-and-Hold (NumPy, tampon préalloué)", lambda: buy_and_hold_values(values, out=out))
+    measure("MA Crossover (pandas d'origine)", lambda: legacy_ma_crossover(prices, SHORT_WINDOW, LONG_WINDOW))
+    measure("MA Crossover (wrapper pandas)", lambda: calculate_ma_crossover(prices, SHORT_WINDOW, LONG_WINDOW))
+    measure("MA Crossover (NumPy, tampons préalloués)",
+            lambda: ma_crossover_values(values, SHORT_WINDOW, LONG_WINDOW, out=out, work=work))
+    measure("Métriques (pandas d'origine)", lambda: legacy_metrics(ma_legacy))
+    measure("Métriques (wrapper pandas)", lambda: calculate_metrics(ma_new))
+    measure("Métriques (NumPy, tampons préalloués)",
+            lambda: performance_metrics(ma_new.to_numpy(), work=work[:, :n_days]))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2520)
@@ -0,0 +1,244 @@
+# scripts/load_test.py
+"""
+Test de charge : simule de nombreuses sessions concurrentes de app.py (modules A et B).
+
+Chaque session est pilotée sans navigateur par streamlit.testing (AppTest) et enchaîne des
+interactions aléatoires (changement de module, de période, de stratégie, de fenêtres MA,
+de poids, de paramètres avancés). Les données proviennent du fournisseur replay
+(src/replay_provider.py) : résultats déterministes, exécution hors ligne, latence d'API simulée.
+
+Rapport : latence des réexécutions (p50/p95/p99) globale et par module, débit, erreurs et
+mémoire (RSS) par session.
+
+Limite : AppTest installe un Runtime factice global pendant chaque réexécution. Avec des sessions
+concurrentes, une réexécution peut ponctuellement trouver ce Runtime déjà retiré par une autre
+(« Runtime hasn't been created ») ; ces cas sont comptés dans les erreurs du rapport.
+
+Usage :
+    python scripts/load_test.py --sessions 50 --interactions 20 --latency 0.02,0.2
+    python scripts/load_test.py --source data/replay --speed 86400 --output data/load_test.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, "app.py")
+sys.path.insert(0, ROOT_DIR)
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+# Widgets exclus des interactions aléatoires (le mode live maintient la session ouverte sur un flux réel)
+EXCLUDED_LABELS = ("Mode Live",)
+
+# Probabilité de changer de module à chaque interaction
+SWITCH_MODULE_PROBABILITY = 0.15
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Test de charge multi-sessions du dashboard.")
+    parser.add_argument("--sessions", type=int, default=50, help="Nombre de sessions simulées.")
+    parser.add_argument("--interactions", type=int, default=20, help="Interactions par session.")
+    parser.add_argument("--concurrency", type=int, default=None, help="Sessions actives simultanément (défaut : toutes).")
+    parser.add_argument("--source", default="synthetic", help="Source replay : 'synthetic', dossier ou fichier CSV.")
+    parser.add_argument("--speed", type=float, default=0.0, help="Accélération de l'horloge virtuelle.")
+    parser.add_argument("--latency", default="0.02,0.1", help="Latence API simulée en secondes ('0.05' ou 'min,max').")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Délai maximal d'une réexécution (secondes).")
+    parser.add_argument("--seed", type=int, default=0, help="Graine des interactions aléatoires.")
+    parser.add_argument("--output", default=None, help="Fichier JSON de sortie du rapport.")
+    return parser.parse_args()
+
+
+def configure_replay(args) -> str:
+    """
+    Active le fournisseur replay pour tous les data handlers (avant l'import de l'application).
+    L'état EWMA écrit par les sessions va dans un dossier temporaire : il ne doit ni polluer ni
+    évincer (prune_state_files) l'état de production de data/cache.
+
+    :return: Chemin du dossier d'état temporaire (à supprimer en fin de test).
+    """
+    os.environ["QUANT_DATA_PROVIDER"] = "replay"
+    os.environ["QUANT_REPLAY_SOURCE"] = args.source
+    os.environ["QUANT_REPLAY_SPEED"] = str(args.speed)
+    os.environ["QUANT_REPLAY_LATENCY"] = args.latency
+    state_dir = tempfile.mkdtemp(prefix="quant_load_test_")
+    os.environ["QUANT_STATE_DIR"] = state_dir
+    return state_dir
+
+
+def current_rss_mb() -> float:
+    """Mémoire résidente du processus en Mo (Linux : /proc, sinon pic via resource)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return float("nan")
+
+
+def current_module(at: AppTest) -> str:
+    """Module affiché par la session ('A' ou 'B')."""
+    try:
+        radios = at.sidebar.radio
+    except KeyError:
+        # Aucune réexécution réussie : page par défaut (module A)
+        return "A"
+    return "B" if radios and "Quant B" in str(radios[0].value) else "A"
+
+
+def random_interaction(at: AppTest, rng: random.Random) -> str:
+    """Applique une interaction aléatoire valide sur la page courante et retourne sa description."""
+    try:
+        radios = at.sidebar.radio
+    except KeyError:
+        return "rerun"
+    if radios and rng.random() < SWITCH_MODULE_PROBABILITY:
+        option = rng.choice([o for o in radios[0].options if o != radios[0].value])
+        radios[0].set_value(option)
+        return f"module -> {option}"
+
+    widgets = [w for w in list(at.selectbox) + list(at.slider) + list(at.number_input) + list(at.checkbox)
+               if not w.disabled and not any(label in w.label for label in EXCLUDED_LABELS)]
+    if not widgets:
+        return "rerun"
+
+    widget = rng.choice(widgets)
+    if widget.type == "selectbox":
+        value = rng.choice(widget.options)
+    elif widget.type == "checkbox":
+        value = not widget.value
+    else:
+        n_steps = int(round((widget.max - widget.min) / widget.step))
+        value = widget.min + rng.randint(0, n_steps) * widget.step
+        if isinstance(widget.value, int):
+            value = int(value)
+    widget.set_value(value)
+    return f"{widget.label} -> {value}"
+
+
+def run_session(session_id: int, args, started=None) -> dict:
+    """
+    Exécute une session complète et retourne ses mesures.
+
+    :param started: threading.Barrier optionnelle pour démarrer toutes les sessions ensemble.
+    """
+    rng = random.Random(args.seed * 100003 + session_id)
+    timings = []
+    errors = []
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+
+    if started is not None:
+        started.wait()
+    for step in range(args.interactions + 1):
+        action = "initial" if step == 0 else random_interaction(at, rng)
+        start = time.perf_counter()
+        try:
+            at.run()
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                errors.append(f"{action}: {at.exception[0].message}")
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            errors.append(f"{action}: {e}")
+        # Module affiché par cette réexécution
+        timings.append((current_module(at), elapsed))
+
+    return {"session": session_id, "timings": timings, "errors": errors, "app": at}
+
+
+def summarize(latencies) -> dict:
+    """Percentiles de latence en millisecondes."""
+    if not latencies:
+        return {}
+    values = np.asarray(latencies) * 1e3
+    return {
+        "count": int(len(values)),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max()),
+    }
+
+
+def main():
+    args = parse_args()
+    state_dir = configure_replay(args)
+    concurrency = args.concurrency or args.sessions
+
+    rss_before = current_rss_mb()
+    # Barrière : si toutes les sessions tiennent dans le pool, elles démarrent ensemble (charge réellement
+    # concurrente). Sinon, les sessions suivantes démarrent au fil de la libération des workers.
+    started = threading.Barrier(args.sessions) if concurrency >= args.sessions else None
+    print(f"--- Test de charge : {args.sessions} sessions x {args.interactions} interactions "
+          f"(concurrence {concurrency}, latence API {args.latency} s) ---")
+
+    wall_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(run_session, i, args, started) for i in range(args.sessions)]
+            results = []
+            for future in futures:
+                results.append(future.result())
+                print(f"\rSessions terminées : {len(results)}/{args.sessions}", end="", flush=True)
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+    wall_time = time.perf_counter() - wall_start
+    print()
+
+    # Mesure mémoire tant que toutes les sessions (et leur session_state) sont encore vivantes
+    rss_after = current_rss_mb()
+
+    all_timings = [t for r in results for t in r["timings"]]
+    errors = [e for r in results for e in r["errors"]]
+    report = {
+        "sessions": args.sessions,
+        "interactions_per_session": args.interactions,
+        "concurrency": concurrency,
+        "latency_setting": args.latency,
+        "wall_time_s": wall_time,
+        "throughput_reruns_per_s": len(all_timings) / wall_time,
+        "rerun_latency": summarize([t for _, t in all_timings]),
+        "rerun_latency_module_a": summarize([t for m, t in all_timings if m == "A"]),
+        "rerun_latency_module_b": summarize([t for m, t in all_timings if m == "B"]),
+        "rss_before_mb": rss_before,
+        "rss_after_mb": rss_after,
+        "memory_per_session_mb": (rss_after - rss_before) / args.sessions,
+        "errors": len(errors),
+        "error_samples": errors[:10],
+    }
+
+    print(f"Durée totale : {wall_time:.1f} s / débit : {report['throughput_reruns_per_s']:.1f} réexécutions/s")
+    for label, key in (("Global", "rerun_latency"), ("Module A", "rerun_latency_module_a"), ("Module B", "rerun_latency_module_b")):
+        stats = report[key]
+        if stats:
+            print(f"{label:<9} n={stats['count']:>5}  p50={stats['p50_ms']:>8.1f} ms  "
+                  f"p95={stats['p95_ms']:>8.1f} ms  p99={stats['p99_ms']:>8.1f} ms  max={stats['max_ms']:>8.1f} ms")
+    print(f"Mémoire : {rss_before:.0f} Mo -> {rss_after:.0f} Mo ({report['memory_per_session_mb']:.2f} Mo/session)")
+    print(f"Erreurs : {len(errors)}")
+    for error in report["error_samples"]:
+        print(f"  - {error}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Rapport écrit dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# scripts/universe_backtest.py
+"""
+Backtest d'une stratégie du module Quant A sur un univers de tickers.
+
+Exemples :
+    python scripts/universe_backtest.py --tickers NVDA AMD INTC --strategy "MA Crossover" --short 50 --long 200
+    python scripts/universe_backtest.py --tickers-file data/universe.txt --period 5y --equity-dir data/equity
+"""
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.quant_a.data_handler import get_historical_data_universe
+from src.quant_a.strategy_core import STRATEGY_REGISTRY
+from src.quant_a.universe_backtest import run_universe_backtest
+
+RESULTS_FILE = "data/universe_backtest_results.csv"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backtest multi-actifs des stratégies Quant A.")
+    parser.add_argument("--tickers", nargs="*", default=[], help="Liste de tickers.")
+    parser.add_argument("--tickers-file", help="Fichier texte contenant un ticker par ligne.")
+    parser.add_argument("--period", default="3y", help="Période yfinance (ex: 1y, 3y, 5y).")
+    parser.add_argument("--strategy", default="MA Crossover", choices=list(STRATEGY_REGISTRY))
+    parser.add_argument("--short", type=int, default=50, help="Fenêtre courte (MA Crossover).")
+    parser.add_argument("--long", type=int, default=200, help="Fenêtre longue (MA Crossover).")
+    parser.add_argument("--workers", type=int, default=None, help="Nombre de processus.")
+    parser.add_argument("--equity-dir", default=None, help="Dossier de sauvegarde des courbes de valeur.")
+    parser.add_argument("--output", default=RESULTS_FILE, help="Fichier CSV des résultats.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    tickers = list(args.tickers)
+    if args.tickers_file:
+        with open(args.tickers_file) as f:
+            tickers += [line.strip() for line in f if line.strip()]
+    if not tickers:
+        print("Erreur : aucun ticker fourni (--tickers ou --tickers-file).")
+        return
+
+    prices = get_historical_data_universe(tickers, period=args.period)
+    if prices.empty:
+        print("Erreur : impossible de récupérer les données de l'univers.")
+        return
+
+    params = {'short_window': args.short, 'long_window': args.long} if args.strategy == "MA Crossover" else {}
+    results = run_universe_backtest(
+        prices, args.strategy, params,
+        max_workers=args.workers,
+        equity_dir=args.equity_dir,
+        progress_callback=lambda done, total: print(f"\rProgression : {done}/{total}", end="", flush=True)
+    )
+    print()
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    results.to_csv(args.output)
+
+    n_errors = int((results["Status"] == "error").sum())
+    print(results.sort_values("Sharpe Ratio", ascending=False).head(20))
+    print(f"\n{len(results) - n_errors} tickers traités, {n_errors} en erreur. Résultats : {args.output}")
+
+
+if __name__ == "__main__":
+    main()
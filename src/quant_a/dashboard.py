@@ -1,4 +1,7 @@
 # src/quant_a/dashboard.py
+import os
+import queue
+from collections import deque
 import streamlit as st
 import pandas as pd
 import plotly.express as px  # <-- NOUVEL IMPORT PLOTLY
@@ -7,6 +10,16 @@ import numpy as np
 from src.quant_a.data_handler import get_historical_data, get_realtime_price, TICKER
 # Import des fonctions de backtesting et métriques
 from src.quant_a.strategy_engine import run_backtest, calculate_metrics
+# Import du mode live (flux poussé et métriques incrémentales)
+from src.quant_a.live_feed import YFinancePoller, ReplayFeed
+from src.quant_a.live_engine import IncrementalBacktest
+
+# Fichier de cotations à rejouer à la place de yfinance en mode live (tests, démonstrations hors ligne)
+LIVE_REPLAY_FILE_ENV = "QUANT_LIVE_REPLAY_FILE"
+LIVE_REPLAY_SPEED_ENV = "QUANT_LIVE_REPLAY_SPEED"
+LIVE_POLL_INTERVAL = 60.0  # Secondes entre deux interrogations de yfinance
+LIVE_REFRESH_SECONDS = 2  # Fréquence de réexécution du seul panneau live
+LIVE_CHART_POINTS = 390  # Nombre maximal de cotations live affichées (une séance en minutes)
     
 # Utilisation du cache Streamlit pour gérer le rafraîchissement des données (Core Feature 5)
 @st.cache_data(ttl=300) # Mise à jour toutes les 300 secondes (5 minutes)
@@ -14,6 +27,119 @@ def load_data(period):
     """Fonction sécurisée pour charger les données historiques."""
     return get_historical_data(period=period)
 
+@st.cache_resource
+def get_live_feed(ticker):
+    """Flux de cotations partagé par toutes les sessions (un seul poller yfinance par ticker)."""
+    replay_file = os.environ.get(LIVE_REPLAY_FILE_ENV)
+    if replay_file:
+        return ReplayFeed(replay_file, speed=float(os.environ.get(LIVE_REPLAY_SPEED_ENV, 60.0)))
+    return YFinancePoller(ticker, interval=LIVE_POLL_INTERVAL)
+
+def render_metrics(final_value, sharpe_ratio, max_drawdown, n_days):
+    """Affiche les métriques clés dans quatre colonnes."""
+    col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+    
+    # Affichage des métriques dans des colonnes pour un look professionnel
+    with col_m1:
+        st.metric(
+            label="Rendement Total Stratégie", 
+            value=f"{final_value - 100:.2f} %",
+            delta=f"{(final_value - 100) / 100:.2%}", # Delta en pourcentage
+            delta_color="normal"
+        )
+    
+    with col_m2:
+        st.metric(
+            label="Sharpe Ratio (Annuel)", 
+            value=sharpe_ratio
+        )
+        
+    with col_m3:
+        st.metric(
+            label="Max Drawdown", 
+            value=max_drawdown
+        )
+
+    with col_m4:
+         # Ajout d'une métrique simple pour compléter
+        st.metric(
+            label="Jours d'Analyse", 
+            value=n_days
+        )
+
+def stop_live_panel():
+    """Désabonne la session du flux live et libère son état."""
+    live = st.session_state.pop("quant_a_live", None)
+    if live is not None:
+        live["feed"].unsubscribe(live["subscription"])
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_panel(prices, strategy_name, strategy_params):
+    """
+    Panneau du mode live, seul réexécuté toutes les LIVE_REFRESH_SECONDS secondes.
+
+    Les cotations poussées par le flux s'accumulent dans la file de la session ; chaque
+    réexécution les intègre en O(1) (IncrementalBacktest) et n'envoie que ce panneau :
+    le prix, les métriques et les LIVE_CHART_POINTS dernières cotations. L'historique
+    n'est ni retéléchargé ni renvoyé, quelle que soit la période choisie.
+    """
+    state_key = (strategy_name, tuple(sorted(strategy_params.items())), prices.index[-1], len(prices))
+    live = st.session_state.get("quant_a_live")
+
+    if live is None or live["key"] != state_key:
+        stop_live_panel()
+        try:
+            engine = IncrementalBacktest(prices, strategy_name, **strategy_params)
+        except ValueError as e:
+            st.warning(f"Mode live indisponible : {e}")
+            return
+        feed = get_live_feed(TICKER)
+        live = {
+            "key": state_key,
+            "engine": engine,
+            "feed": feed,
+            "subscription": feed.subscribe(),
+            "points": deque(maxlen=LIVE_CHART_POINTS),
+            "snapshot": engine.snapshot(),
+            "last_update": None,
+        }
+        st.session_state["quant_a_live"] = live
+
+    # Intègre les cotations reçues depuis la dernière réexécution
+    while True:
+        try:
+            quote = live["subscription"].get_nowait()
+        except queue.Empty:
+            break
+        live["snapshot"] = live["engine"].update(quote.timestamp, quote.price)
+        live["points"].append((quote.timestamp, live["snapshot"]["Normalized Price"], live["snapshot"]["Value"]))
+        live["last_update"] = quote.timestamp
+
+    snapshot = live["snapshot"]
+    st.markdown("#### 🔴 Mode Live")
+    col_price, col_update = st.columns([1, 4])
+    with col_price:
+        st.metric(label=f"Prix Live {TICKER}", value=f"${snapshot['Price']:,.2f}")
+    with col_update:
+        if live["last_update"] is None:
+            st.caption("En attente de cotations...")
+        else:
+            st.caption(f"Dernière cotation: {live['last_update'].strftime('%Y-%m-%d %H:%M:%S')}")
+
+    render_metrics(
+        snapshot["Value"],
+        f"{snapshot['Sharpe Ratio']:.2f}",
+        f"{snapshot['Max Drawdown'] * 100:.2f} %",
+        snapshot["Days"]
+    )
+
+    if live["points"]:
+        timestamps, normalized_prices, values = zip(*live["points"])
+        st.line_chart(pd.DataFrame({
+            'Prix Normalisé (Actif)': normalized_prices,
+            f'Valeur Cumulée ({strategy_name})': values
+        }, index=pd.DatetimeIndex(timestamps)))
+
 def run_quant_a_dashboard():
     """Contient la logique de l'interface et de l'affichage pour le module Quant A."""
     
@@ -37,7 +163,11 @@ def run_quant_a_dashboard():
         st.caption(f"Dernière mise à jour: {pd.Timestamp.now().strftime('%H:%M:%S')}")
         
     with col3:
-        st.caption("Les données se rafraîchissent automatiquement toutes les 5 minutes.")
+        live_mode = st.checkbox("Mode Live (cotations poussées en continu)", value=False)
+        if live_mode:
+            st.caption("Les nouvelles cotations sont poussées en continu vers le panneau live (en bas de page).")
+        else:
+            st.caption("Les données se rafraîchissent automatiquement toutes les 5 minutes.")
     
     st.markdown("---")
 
@@ -130,35 +260,14 @@ def run_quant_a_dashboard():
         # Extraction des valeurs scalaires
         final_value = strategy_results.iloc[-1].item() 
         
-        col_m1, col_m2, col_m3, col_m4 = st.columns(4)
-        
-        # Affichage des métriques dans des colonnes pour un look professionnel
-        with col_m1:
-            st.metric(
-                label="Rendement Total Stratégie", 
-                value=f"{final_value - 100:.2f} %",
-                delta=f"{(final_value - 100) / 100:.2%}" if final_value > 100 else f"{(final_value - 100) / 100:.2%}", # Delta en pourcentage
-                delta_color="normal"
-            )
-        
-        with col_m2:
-            st.metric(
-                label="Sharpe Ratio (Annuel)", 
-                value=metrics['Sharpe Ratio (Annuel)']
-            )
-            
-        with col_m3:
-            st.metric(
-                label="Max Drawdown", 
-                value=metrics['Max Drawdown']
-            )
-
-        with col_m4:
-             # Ajout d'une métrique simple pour compléter
-            st.metric(
-                label="Jours d'Analyse", 
-                value=len(historical_data)
-            )
+        render_metrics(final_value, metrics['Sharpe Ratio (Annuel)'], metrics['Max Drawdown'], len(historical_data))
+
+        # --- Section 5 : Mode Live (mises à jour poussées, incrémentales) ---
+        if live_mode:
+            st.markdown("---")
+            live_panel(prices, selected_strategy, strategy_params)
+        else:
+            stop_live_panel()
             
     else:
         # Gestion d'erreur (Robustness)
@@ -1,5 +1,6 @@
 import yfinance as yf
 import pandas as pd
+from src.replay_provider import get_replay_provider
 
 # Ticker choisi : NVIDIA
 TICKER = "NVDA"
@@ -9,6 +10,10 @@ def get_historical_data(period="6mo"):
     Récupère les données historiques de NVIDIA (Prix ajusté) pour une période donnée.
     Utilise une API publique (yfinance)[cite: 17].
     """
+    replay = get_replay_provider()
+    if replay is not None:
+        return replay.get_historical_data(TICKER, period=period)
+
     try:
         # Récupère les données (via une API publique - Core Feature 16)
         data = yf.download(TICKER, period=period, interval="1d", progress=False)
@@ -24,24 +29,66 @@ def get_historical_data(period="6mo"):
         print(f"Erreur lors de la récupération des données historiques: {e}")
         return pd.DataFrame()
 
-def get_realtime_price():
+def get_historical_data_universe(tickers, period="1y"):
     """
-    Récupère le prix actuel de NVIDIA pour l'affichage en temps réel[cite: 6].
+    Récupère les prix ajustés historiques d'un univers de tickers (colonnes = tickers),
+    pour le backtest multi-actifs (universe_backtest.py).
     """
+    replay = get_replay_provider()
+    if replay is not None:
+        return replay.get_historical_data_multi(tickers, period=period)
+
     try:
-        ticker_obj = yf.Ticker(TICKER)
+        data = yf.download(list(tickers), period=period, interval="1d", progress=False)
+
+        if 'Adj Close' in data.columns:
+            prices = data['Adj Close'].dropna(how='all')
+        elif 'Close' in data.columns:
+            prices = data['Close'].dropna(how='all')
+        else:
+            print("Erreur : Colonne 'Adj Close' ou 'Close' introuvable.")
+            return pd.DataFrame()
+
+        # Nettoyage pour le cas d'un seul ticker
+        if isinstance(prices, pd.Series):
+            prices = prices.to_frame(list(tickers)[0])
+
+        return prices
+    except Exception as e:
+        # Gestion d'erreur (Robustness)
+        print(f"Erreur lors de la récupération des données de l'univers : {e}")
+        return pd.DataFrame()
+
+def get_realtime_quote(ticker=TICKER):
+    """
+    Récupère le dernier prix (float) d'un ticker, ou None s'il est indisponible.
+    Utilisé par l'affichage en temps réel et par le flux live (live_feed.py).
+    """
+    replay = get_replay_provider()
+    if replay is not None:
+        return replay.get_realtime_quote(ticker)
+
+    try:
+        ticker_obj = yf.Ticker(ticker)
         info = ticker_obj.info
         # Cherche le prix actuel ou le prix du marché régulier
         current_price = info.get('currentPrice') or info.get('regularMarketPrice')
-
-        if current_price:
-            return f"{current_price:,.2f}"
-        else:
-            return "N/A"
+        return float(current_price) if current_price else None
 
     except Exception as e:
         # Gestion d'erreur (Robustness) [cite: 60]
         print(f"Erreur lors de la récupération du prix actuel: {e}")
+        return None
+
+def get_realtime_price():
+    """
+    Récupère le prix actuel de NVIDIA pour l'affichage en temps réel[cite: 6].
+    """
+    current_price = get_realtime_quote()
+
+    if current_price:
+        return f"{current_price:,.2f}"
+    else:
         return "N/A"
 
 if __name__ == '__main__':
@@ -0,0 +1,198 @@
+# src/quant_a/live_engine.py
+"""
+Backtest et métriques incrémentaux pour le mode live du module Quant A.
+
+L'historique est traité une seule fois par les noyaux NumPy (strategy_core.py) ; chaque
+nouvelle cotation est ensuite intégrée en O(1) : valeur de la stratégie, moyennes mobiles
+(sommes glissantes), moyenne/variance des rendements (Welford) et Max Drawdown.
+
+Une cotation dont la date est celle de la dernière barre révise cette barre (séance en
+cours) ; une cotation d'une nouvelle date valide la barre précédente et en ouvre une nouvelle.
+"""
+import math
+import numpy as np
+import pandas as pd
+from src.quant_a.strategy_core import STRATEGY_REGISTRY, ANNUALIZATION_DAYS
+
+LIVE_STRATEGIES = ("Buy-and-Hold", "MA Crossover")
+
+
+class IncrementalBacktest:
+    """État incrémental d'une stratégie et de ses métriques (Sharpe, Max Drawdown, rendement total)."""
+
+    def __init__(self, prices: pd.Series, strategy_name: str, risk_free_rate: float = 0.04, **params):
+        """
+        :param prices: pd.Series des prix historiques (la dernière barre est considérée en cours).
+        :param strategy_name: 'Buy-and-Hold' ou 'MA Crossover'.
+        :param risk_free_rate: Taux sans risque annuel.
+        :param params: Paramètres de la stratégie (ex: short_window, long_window).
+        """
+        if strategy_name not in LIVE_STRATEGIES:
+            raise ValueError(f"Stratégie non disponible en mode live : {strategy_name}")
+
+        strategy = STRATEGY_REGISTRY[strategy_name]
+        self.params = {**strategy["default_params"], **params}
+        self.strategy_name = strategy_name
+        self.risk_free_rate = risk_free_rate
+
+        values = np.ascontiguousarray(prices.to_numpy(dtype=np.float64)).ravel()
+        committed = values[:-1]
+        min_length = strategy["min_length"](self.params)
+        if len(committed) < max(min_length, 2):
+            raise ValueError(f"Historique trop court pour le mode live ({len(values)} jours).")
+
+        # 1. Valeur de la stratégie sur l'historique validé (noyau NumPy)
+        strategy_values = strategy["func"](committed, **self.params)
+        defined = strategy_values[~np.isnan(strategy_values)]
+
+        self.last_date = pd.Timestamp(prices.index[-1]).normalize()
+        self.pending_price = float(values[-1])
+        self.first_price = float(values[0])
+        self.last_price = float(committed[-1])
+        self.value = float(defined[-1])
+        self.n_bars = len(committed)
+
+        # 2. Statistiques des rendements de la stratégie (moyenne et M2 de Welford)
+        daily_returns = defined[1:] / defined[:-1] - 1.0
+        daily_returns = daily_returns[~np.isnan(daily_returns)]
+        self.n_returns = len(daily_returns)
+        self.mean = float(daily_returns.mean()) if self.n_returns else 0.0
+        self.m2 = float(np.square(daily_returns - self.mean).sum()) if self.n_returns else 0.0
+        # Max Drawdown : comme performance_metrics, la valeur cumulée commence au premier rendement
+        # (la valeur initiale n'est pas un sommet)
+        if len(defined) > 1:
+            tail = defined[1:]
+            self.peak = float(tail.max())
+            self.max_drawdown = float((tail / np.maximum.accumulate(tail) - 1.0).min())
+        else:
+            self.peak = -math.inf
+            self.max_drawdown = 0.0
+
+        # 3. Fenêtres des moyennes mobiles : tampon circulaire des derniers prix validés
+        if strategy_name == "MA Crossover":
+            self.short_window = self.params['short_window']
+            self.long_window = self.params['long_window']
+            size = max(self.short_window, self.long_window)
+            self._ring = np.array(committed[-size:], dtype=np.float64)
+            self._ring_head = 0  # Position du prix le plus ancien
+            self.short_sum = float(committed[-self.short_window:].sum())
+            self.long_sum = float(committed[-self.long_window:].sum())
+            self.position = self._signal(self.short_sum, self.long_sum, self.n_bars)
+        else:
+            self.position = 1.0
+
+    def _signal(self, short_sum: float, long_sum: float, n_bars: int) -> float:
+        """Position pour la barre suivante : 1.0 si MA courte > MA longue (barre d'indice >= long_window)."""
+        if n_bars - 1 < self.long_window:
+            return 0.0
+        return 1.0 if short_sum / self.short_window > long_sum / self.long_window else 0.0
+
+    def _ring_get(self, lag: int) -> float:
+        """Prix validé d'il y a `lag` barres (1 = dernier prix validé)."""
+        size = len(self._ring)
+        return self._ring[(self._ring_head - lag) % size]
+
+    def _advance(self, price: float) -> dict:
+        """Calcule (sans modifier l'état) l'état obtenu en validant une barre au prix `price`."""
+        market_return = price / self.last_price - 1.0
+        strategy_return = self.position * market_return
+        value = self.value * (1.0 + strategy_return)
+
+        n_returns = self.n_returns + 1
+        delta = strategy_return - self.mean
+        mean = self.mean + delta / n_returns
+        m2 = self.m2 + delta * (strategy_return - mean)
+        peak = max(self.peak, value)
+        max_drawdown = min(self.max_drawdown, value / peak - 1.0)
+
+        state = dict(last_price=price, value=value, n_bars=self.n_bars + 1, n_returns=n_returns,
+                     mean=mean, m2=m2, peak=peak, max_drawdown=max_drawdown)
+
+        if self.strategy_name == "MA Crossover":
+            size = len(self._ring)
+            # Prix sortant de chaque fenêtre (le tampon contient les `size` derniers prix validés)
+            short_out = self._ring_get(self.short_window) if self.short_window <= size else 0.0
+            long_out = self._ring_get(self.long_window) if self.long_window <= size else 0.0
+            state["short_sum"] = self.short_sum + price - short_out
+            state["long_sum"] = self.long_sum + price - long_out
+            state["position"] = self._signal(state["short_sum"], state["long_sum"], state["n_bars"])
+
+        return state
+
+    def _commit(self, price: float) -> None:
+        """Valide une barre au prix `price` (mise à jour en O(1))."""
+        state = self._advance(price)
+        if self.strategy_name == "MA Crossover":
+            self._ring[self._ring_head] = price
+            self._ring_head = (self._ring_head + 1) % len(self._ring)
+        self.__dict__.update(state)
+
+    def update(self, timestamp, price: float) -> dict:
+        """
+        Intègre une cotation et retourne l'état courant (barre en cours incluse).
+        Une cotation datée d'un jour suivant n'ouvre une nouvelle barre que si ce jour est ouvré
+        et que le prix a changé ; une cotation antérieure à la barre en cours est ignorée.
+
+        :param timestamp: Horodatage de la cotation.
+        :param price: Prix coté.
+        :return: dict des valeurs affichées (voir snapshot()).
+        """
+        date = pd.Timestamp(timestamp).normalize()
+        if date < self.last_date:
+            # Cotation d'une séance déjà validée (ex: flux rejoué depuis le début) : ignorée
+            return self.snapshot()
+        if date > self.last_date:
+            # Week-end, jour férié ou avant l'ouverture : le prix n'a pas bougé, pas de nouvelle séance
+            if date.dayofweek >= 5 or float(price) == self.pending_price:
+                return self.snapshot()
+            # Nouvelle séance : la barre en cours est validée
+            self._commit(self.pending_price)
+            self.last_date = date
+        self.pending_price = float(price)
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        """
+        État courant : barre validée + barre en cours appliquée provisoirement.
+
+        :return: dict avec 'Price', 'Normalized Price', 'Value', 'Total Return', 'Sharpe Ratio',
+            'Max Drawdown' et 'Days'.
+        """
+        state = self._advance(self.pending_price)
+
+        sharpe_ratio = math.nan
+        if state["n_returns"] >= 2:
+            volatility = math.sqrt(state["m2"] / (state["n_returns"] - 1)) * math.sqrt(ANNUALIZATION_DAYS)
+            avg_return = state["mean"] * ANNUALIZATION_DAYS
+            sharpe_ratio = 0.0 if volatility == 0 else (avg_return - self.risk_free_rate) / volatility
+
+        return {
+            "Price": self.pending_price,
+            "Normalized Price": self.pending_price / self.first_price * 100.0,
+            "Value": state["value"],
+            "Total Return": state["value"] - 100.0,
+            "Sharpe Ratio": sharpe_ratio,
+            "Max Drawdown": state["max_drawdown"],
+            "Days": state["n_bars"],
+        }
+
+
+if __name__ == '__main__':
+    # Vérification : l'état incrémental coïncide avec le backtest complet
+    from src.quant_a.strategy_engine import calculate_buy_and_hold, calculate_ma_crossover, calculate_metrics
+
+    dates = pd.bdate_range(start='2023-01-02', periods=400)
+    prices_test = pd.Series(100 * np.exp(np.cumsum(np.random.normal(0.0005, 0.02, 400))), index=dates)
+
+    for name, params, full in (
+        ("Buy-and-Hold", {}, calculate_buy_and_hold(prices_test)),
+        ("MA Crossover", dict(short_window=20, long_window=100), calculate_ma_crossover(prices_test, 20, 100)),
+    ):
+        engine = IncrementalBacktest(prices_test.iloc[:300], name, **params)
+        for date, price in prices_test.iloc[300:].items():
+            snapshot = engine.update(date, price)
+
+        print(f"--- {name} ---")
+        print(f"Valeur incrémentale : {snapshot['Value']:.6f} / complète : {full.iloc[-1]:.6f}")
+        print(f"Sharpe incrémental : {snapshot['Sharpe Ratio']:.2f} / Max Drawdown : {snapshot['Max Drawdown'] * 100:.2f} %")
+        print(f"Métriques complètes : {calculate_metrics(full)}")
@@ -0,0 +1,156 @@
+# src/quant_a/live_feed.py
+"""
+Flux de cotations « push » pour le mode live du dashboard.
+
+Un flux unique par ticker (partagé entre les sessions) produit des cotations dans un
+thread et les pousse dans une file par session abonnée. Le coût côté serveur est donc
+proportionnel au nombre de nouvelles cotations, et non à la longueur de l'historique.
+
+- YFinancePoller : interroge yfinance à intervalle régulier (production).
+- ReplayFeed : rejoue un fichier CSV (ou un DataFrame) de cotations, en accéléré (tests, hors ligne).
+"""
+import abc
+import queue
+import threading
+import weakref
+from typing import NamedTuple
+import pandas as pd
+from src.quant_a.data_handler import get_realtime_quote, TICKER
+
+
+class Quote(NamedTuple):
+    """Cotation poussée aux sessions abonnées."""
+    timestamp: pd.Timestamp
+    price: float
+
+
+class LiveFeed(abc.ABC):
+    """
+    Diffuseur de cotations : un thread producteur, une file bornée par abonné.
+
+    Le thread démarre au premier abonnement et s'arrête au dernier désabonnement. Les files
+    sont référencées faiblement : celle d'une session fermée sans désabonnement disparaît
+    avec la session.
+    Si une session ne consomme pas assez vite, les cotations les plus anciennes de sa
+    file sont écartées (seules les plus récentes comptent pour l'affichage).
+    """
+
+    def __init__(self, max_queue_size: int = 1000):
+        self.max_queue_size = max_queue_size
+        self._subscribers = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def subscribe(self) -> queue.Queue:
+        """Abonne une session et retourne sa file de cotations."""
+        subscription = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._thread is None or not self._thread.is_alive() or self._stop_event.is_set():
+                # Nouvelle génération de thread avec son propre signal d'arrêt : un thread en cours
+                # d'arrêt (désabonnement juste avant) se termine seul sans bloquer le nouveau
+                self._stop_event = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop_event,),
+                                                name=type(self).__name__, daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: queue.Queue) -> None:
+        """Désabonne une session (le thread s'arrête s'il n'y a plus d'abonnés)."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+            if not self._subscribers:
+                self._stop_event.set()
+
+    def publish(self, quote: Quote) -> None:
+        """Pousse une cotation dans la file de chaque abonné."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            if not subscribers:
+                self._stop_event.set()
+
+        for subscription in subscribers:
+            while True:
+                try:
+                    subscription.put_nowait(quote)
+                    break
+                except queue.Full:
+                    try:
+                        subscription.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    @abc.abstractmethod
+    def _run(self, stop_event: threading.Event) -> None:
+        """
+        Boucle de production des cotations (à implémenter par les sous-classes).
+
+        :param stop_event: Signal d'arrêt propre à ce thread.
+        """
+
+
+class YFinancePoller(LiveFeed):
+    """Interroge yfinance toutes les `interval` secondes et pousse le prix s'il a changé."""
+
+    def __init__(self, ticker: str = TICKER, interval: float = 60.0, **kwargs):
+        super().__init__(**kwargs)
+        self.ticker = ticker
+        self.interval = interval
+
+    def _run(self, stop_event: threading.Event) -> None:
+        last_price = None
+        while not stop_event.is_set():
+            price = get_realtime_quote(self.ticker)
+            if price is not None and price != last_price and not stop_event.is_set():
+                self.publish(Quote(pd.Timestamp.now(), price))
+                last_price = price
+            stop_event.wait(self.interval)
+
+
+class ReplayFeed(LiveFeed):
+    """
+    Rejoue des cotations enregistrées en respectant leurs écarts temporels divisés par `speed`.
+
+    :param source: Chemin d'un CSV (colonnes 'Date'/'timestamp' et 'Price') ou pd.DataFrame équivalent.
+    :param speed: Facteur d'accélération (ex: 3600 = une heure de marché par seconde).
+    :param max_delay: Attente maximale entre deux cotations (en secondes), pour sauter les nuits/week-ends.
+    :param loop: Rejoue le fichier en boucle.
+    """
+
+    def __init__(self, source, speed: float = 60.0, max_delay: float = 2.0, loop: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.quotes = self._load_quotes(source)
+        self.speed = speed
+        self.max_delay = max_delay
+        self.loop = loop
+
+    @staticmethod
+    def _load_quotes(source) -> list:
+        data = pd.read_csv(source) if isinstance(source, str) else source.reset_index()
+        time_column = next(c for c in data.columns if str(c).lower() in ("date", "datetime", "timestamp", "index"))
+        timestamps = pd.to_datetime(data[time_column])
+        return [Quote(ts, float(price)) for ts, price in zip(timestamps, data['Price'])]
+
+    def _run(self, stop_event: threading.Event) -> None:
+        while not stop_event.is_set():
+            previous = None
+            for quote in self.quotes:
+                if previous is not None:
+                    delay = (quote.timestamp - previous.timestamp).total_seconds() / self.speed
+                    if stop_event.wait(min(max(delay, 0.0), self.max_delay)):
+                        return
+                self.publish(quote)
+                previous = quote
+            if not self.loop:
+                return
+
+
+if __name__ == '__main__':
+    # Test du module : rejoue quelques cotations synthétiques à grande vitesse
+    dates = pd.date_range(start='2024-01-02 09:30', periods=5, freq='min')
+    feed = ReplayFeed(pd.DataFrame({'Price': [100.0, 100.5, 101.0, 100.8, 101.2]}, index=dates), speed=600)
+    subscription = feed.subscribe()
+    for _ in range(5):
+        print(subscription.get(timeout=5))
+    feed.unsubscribe(subscription)
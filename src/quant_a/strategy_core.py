@@ -0,0 +1,245 @@
+# src/quant_a/strategy_core.py
+"""
+Cœur numérique (NumPy) des stratégies et des métriques du module Quant A.
+
+Les fonctions travaillent sur des tableaux float64 contigus et acceptent des tampons
+préalloués (`out`, `work`) afin de limiter les allocations lors d'appels répétés.
+Les wrappers pandas de strategy_engine.py convertissent les entrées/sorties.
+L'ordre des opérations reproduit celui de l'implémentation pandas d'origine, de sorte
+que les résultats sont identiques au bit près.
+"""
+import numpy as np
+
+ANNUALIZATION_DAYS = 252  # Jours de trading par an
+
+
+def as_float_array(values) -> np.ndarray:
+    """Convertit un tableau (ou une colonne unique) en vecteur float64 contigu, sans copie si possible."""
+    return np.ascontiguousarray(values, dtype=np.float64).ravel()
+
+
+def _cumprod_skipna(growth: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Produit cumulé ignorant les NaN (comportement de pandas.Series.cumprod)."""
+    nan_mask = np.isnan(growth)
+    if nan_mask.any():
+        np.copyto(out, growth)
+        out[nan_mask] = 1.0
+        np.cumprod(out, out=out)
+        out[nan_mask] = np.nan
+    else:
+        np.cumprod(growth, out=out)
+    return out
+
+
+def rolling_mean(values: np.ndarray, window: int, out: np.ndarray = None, work: np.ndarray = None) -> np.ndarray:
+    """
+    Moyenne mobile simple (NaN tant que la fenêtre n'est pas complète), via somme cumulée en O(T).
+
+    :param values: np.ndarray float64 des prix.
+    :param window: Taille de la fenêtre.
+    :param out: Tampon de sortie optionnel (même taille que values).
+    :param work: Tampon de travail optionnel de taille len(values) + 1.
+    :return: np.ndarray des moyennes mobiles.
+    """
+    n = len(values)
+    if out is None:
+        out = np.empty(n)
+    if window > n:
+        out.fill(np.nan)
+        return out
+    if work is None:
+        work = np.empty(n + 1)
+
+    nan_mask = np.isnan(values)
+    has_nan = nan_mask.any()
+
+    # Centrage sur le premier prix pour limiter les erreurs d'arrondi de la somme cumulée
+    reference = values[~nan_mask][0] if has_nan and not nan_mask.all() else values[0]
+    np.subtract(values, reference, out=out)
+    if has_nan:
+        out[nan_mask] = 0.0
+
+    work[0] = 0.0
+    np.cumsum(out, out=work[1:])
+
+    window_sums = out[window - 1:]
+    np.subtract(work[window:], work[:n - window + 1], out=window_sums)
+    window_sums /= window
+    window_sums += reference
+    out[:window - 1] = np.nan
+
+    if has_nan:
+        # Une fenêtre contenant un NaN donne NaN (comme pandas.rolling avec min_periods=window)
+        np.cumsum(nan_mask, out=work[1:])
+        window_nans = work[window:] - work[:n - window + 1]
+        window_sums[window_nans > 0] = np.nan
+
+    return out
+
+
+def buy_and_hold_values(prices: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Valeur cumulée (Base 100) de la stratégie Buy-and-Hold.
+
+    :param prices: np.ndarray float64 des prix (non vide).
+    :param out: Tampon de sortie optionnel (même taille que prices).
+    :return: np.ndarray de la valeur cumulée.
+    """
+    if out is None:
+        out = np.empty(len(prices))
+
+    # Rendements quotidiens (premier rendement à 0), puis croissance 1 + r
+    out[0] = 0.0
+    np.divide(prices[1:], prices[:-1], out=out[1:])
+    out[1:] -= 1.0
+    np.nan_to_num(out, copy=False, nan=0.0, posinf=np.inf, neginf=-np.inf)
+    out += 1.0
+
+    np.cumprod(out, out=out)
+    out /= out[0]
+    out *= 100.0
+    return out
+
+
+def ma_crossover_values(prices: np.ndarray, short_window: int = 50, long_window: int = 200,
+                        out: np.ndarray = None, work: np.ndarray = None) -> np.ndarray:
+    """
+    Valeur cumulée (Base 100) de la stratégie MA Crossover.
+
+    Position longue (1.0) lorsque la MA courte > MA longue, à partir de la barre `long_window`.
+    Le premier élément vaut NaN (pas de rendement de marché le premier jour).
+
+    :param prices: np.ndarray float64 des prix (len(prices) >= long_window).
+    :param short_window: Fenêtre de la Moyenne Mobile Courte (jours).
+    :param long_window: Fenêtre de la Moyenne Mobile Longue (jours).
+    :param out: Tampon de sortie optionnel (même taille que prices).
+    :param work: Tampon de travail optionnel de forme (3, len(prices) + 1).
+    :return: np.ndarray de la valeur cumulée.
+    """
+    n = len(prices)
+    if out is None:
+        out = np.empty(n)
+    if work is None:
+        work = np.empty((3, n + 1))
+
+    short_ma = rolling_mean(prices, short_window, out=work[0, :n], work=work[2])
+    long_ma = rolling_mean(prices, long_window, out=work[1, :n], work=work[2])
+    long_valid = np.flatnonzero(~np.isnan(long_ma))
+    start = long_valid[0] if len(long_valid) else None
+
+    # Signal de la veille : 1.0 si MA courte > MA longue (à partir de long_window), 0.0 sinon
+    signal = work[2, :n]
+    np.greater(short_ma, long_ma, out=signal)
+    signal[:long_window] = 0.0
+    previous_signal = work[0, :n]
+    previous_signal[0] = 0.0
+    previous_signal[1:] = signal[:-1]
+
+    # Rendements de la stratégie : rendement du marché * position de la veille
+    growth = work[1, :n]
+    growth[0] = np.nan
+    np.divide(prices[1:], prices[:-1], out=growth[1:])
+    growth[1:] -= 1.0
+    growth *= previous_signal
+    growth += 1.0
+
+    _cumprod_skipna(growth, out)
+
+    # Normalisation sur la première barre où la MA longue est définie
+    if start is not None and not out[start] == 0:
+        start_value = out[start]
+    else:
+        # Fallback si la MA longue n'est jamais définie ou si la valeur est nulle (devrait être rare)
+        start_value = out[~np.isnan(out)][0]
+
+    out /= start_value
+    out *= 100.0
+    return out
+
+
+def performance_metrics(values: np.ndarray, risk_free_rate: float = 0.04, work: np.ndarray = None) -> tuple:
+    """
+    Max Drawdown et Sharpe Ratio annuel d'une série de valeur cumulée.
+
+    :param values: np.ndarray float64 de la valeur cumulée (au moins 2 éléments).
+    :param risk_free_rate: Taux sans risque annuel.
+    :param work: Tampon de travail optionnel de forme (3, len(values)).
+    :return: tuple (max_drawdown, sharpe_ratio) en float.
+    """
+    n = len(values)
+    if work is None:
+        work = np.empty((3, n))
+
+    # Rendements quotidiens de la valeur cumulée (NaN exclus)
+    daily_returns = work[0, :n - 1]
+    np.divide(values[1:], values[:-1], out=daily_returns)
+    daily_returns -= 1.0
+    nan_mask = np.isnan(daily_returns)
+    if nan_mask.any():
+        daily_returns = daily_returns[~nan_mask]
+    m = len(daily_returns)
+
+    if m == 0:
+        return np.nan, np.nan
+
+    # 1. Max Drawdown
+    cumulative = work[1, :m]
+    np.add(daily_returns, 1.0, out=cumulative)
+    np.cumprod(cumulative, out=cumulative)
+    rolling_max = np.maximum.accumulate(cumulative, out=work[2, :m])
+    np.divide(cumulative, rolling_max, out=cumulative)
+    cumulative -= 1.0
+    max_drawdown = float(cumulative.min())
+
+    # 2. Sharpe Ratio annuel (moyenne puis variance en deux passes, ddof=1)
+    mean = daily_returns.sum() / m
+    avg_return = float(mean) * ANNUALIZATION_DAYS
+    if m < 2:
+        volatility = np.nan
+    else:
+        squares = work[1, :m]
+        np.subtract(mean, daily_returns, out=squares)
+        np.square(squares, out=squares)
+        volatility = float(float(np.sqrt(squares.sum() / (m - 1))) * np.sqrt(ANNUALIZATION_DAYS))
+
+    if volatility == 0:
+        sharpe_ratio = 0.0
+    else:
+        sharpe_ratio = float((avg_return - risk_free_rate) / volatility)
+
+    return max_drawdown, sharpe_ratio
+
+
+# Registre des stratégies : nom -> noyau NumPy, paramètres par défaut et longueur minimale requise.
+# Chaque noyau a la signature func(prices, out=None, **params) et retourne la valeur cumulée (Base 100).
+STRATEGY_REGISTRY = {}
+
+
+def register_strategy(name: str, func, default_params: dict = None, min_length=None) -> None:
+    """
+    Enregistre une stratégie utilisable par le runner multi-actifs (universe_backtest.py).
+
+    :param name: Nom de la stratégie (ex: 'MA Crossover').
+    :param func: Noyau NumPy func(prices, out=None, **params) -> np.ndarray.
+    :param default_params: Paramètres par défaut de la stratégie.
+    :param min_length: Fonction params -> nombre minimal de prix requis (1 par défaut).
+    """
+    STRATEGY_REGISTRY[name] = {
+        "func": func,
+        "default_params": dict(default_params or {}),
+        "min_length": min_length or _default_min_length,
+    }
+
+
+def _default_min_length(params: dict) -> int:
+    """Nombre minimal de prix par défaut : un seul prix suffit."""
+    return 1
+
+
+def _ma_crossover_min_length(params: dict) -> int:
+    """Nombre minimal de prix pour le MA Crossover : la MA longue doit être définie."""
+    return params['long_window']
+
+
+register_strategy("Buy-and-Hold", buy_and_hold_values)
+register_strategy("MA Crossover", ma_crossover_values, {'short_window': 50, 'long_window': 200}, _ma_crossover_min_length)
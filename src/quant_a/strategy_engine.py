@@ -1,6 +1,7 @@
 # src/quant_a/strategy_engine.py
 import pandas as pd
 import numpy as np
+from src.quant_a.strategy_core import as_float_array, buy_and_hold_values, ma_crossover_values, performance_metrics
 
 def calculate_buy_and_hold(prices: pd.Series) -> pd.Series:
     """
@@ -12,17 +13,13 @@ def calculate_buy_and_hold(prices: pd.Series) -> pd.Series:
     """
     if prices.empty:
         return pd.Series(dtype=float)
-        
-    # Rendements quotidiens
-    returns = prices.pct_change().fillna(0)
-    
-    # Performance cumulée (valeur du portefeuille)
-    cumulative_value = (1 + returns).cumprod()
-    
-    # Normalise pour commencer à 100.0
-    cumulative_value = cumulative_value / cumulative_value.iloc[0] * 100.0
-    
-    return cumulative_value
+
+    # Calcul NumPy sur un tableau contigu, puis reconstruction du même type pandas que l'entrée
+    values = buy_and_hold_values(as_float_array(prices.to_numpy()))
+
+    if isinstance(prices, pd.DataFrame):
+        return pd.DataFrame(values.reshape(-1, 1), index=prices.index, columns=prices.columns)
+    return pd.Series(values, index=prices.index, name=prices.name)
 
 def calculate_ma_crossover(prices: pd.Series, short_window: int = 50, long_window: int = 200) -> pd.Series:
     """
@@ -41,35 +38,9 @@ def calculate_ma_crossover(prices: pd.Series, short_window: int = 50, long_windo
         else:
             return pd.Series(dtype=float)
 
-    # Assure que 'prices' est un DataFrame pour le calcul des MAs
-    prices_df = pd.DataFrame({'Price': prices.values.ravel()}, index=prices.index)
-    
-    # Calcul des Moyennes Mobiles
-    prices_df['Short_MA'] = prices_df['Price'].rolling(window=short_window).mean()
-    prices_df['Long_MA'] = prices_df['Price'].rolling(window=long_window).mean()
-    
-    # Signal : 1.0 (Achat/Long) si MA courte > MA longue, 0.0 sinon.
-    prices_df['Signal'] = 0.0
-    prices_df['Signal'][long_window:] = np.where(prices_df['Short_MA'][long_window:] > prices_df['Long_MA'][long_window:], 1.0, 0.0)
-    
-    prices_df['Market_Returns'] = prices_df['Price'].pct_change()
-    
-    # Rendements de la stratégie : Rendement du marché * Position de la veille (Signal.shift(1))
-    prices_df['Strategy_Returns'] = prices_df['Signal'].shift(1).fillna(0) * prices_df['Market_Returns']
-    
-    # Valeur cumulée du portefeuille (1 + rendement cumulé)
-    cumulative_value = (1 + prices_df['Strategy_Returns']).cumprod()
-    
-    # Normalisation : Démarrer la stratégie après la période d'initialisation
-    # Utilise l'index valide (après la MA longue) pour la normalisation à 100.0
-    start_index = prices_df['Long_MA'].first_valid_index()
-    if start_index in cumulative_value.index and not cumulative_value[start_index] == 0:
-        cumulative_value = cumulative_value / cumulative_value[start_index] * 100.0
-    else:
-        # Fallback si le premier index valide est introuvable ou nul (devrait être rare)
-        cumulative_value = cumulative_value / cumulative_value.dropna().iloc[0] * 100.0
-    
-    return cumulative_value
+    values = ma_crossover_values(as_float_array(prices.to_numpy()), short_window, long_window)
+
+    return pd.Series(values, index=prices.index, name='Strategy_Returns')
 
 def calculate_metrics(returns: pd.Series, risk_free_rate=0.04) -> dict:
     """
@@ -82,32 +53,8 @@ def calculate_metrics(returns: pd.Series, risk_free_rate=0.04) -> dict:
     if returns.empty or len(returns) < 2:
         return {"Max Drawdown": "N/A", "Sharpe Ratio (Annuel)": "N/A"}
         
-    # Rendements quotidiens (basés sur la Série de Valeur Cumulée)
-    daily_returns = returns.pct_change().dropna()
-
-    # 1. Max Drawdown
-    cumulative_returns = (1 + daily_returns).cumprod()
-    rolling_max = cumulative_returns.cummax()
-    drawdown = (cumulative_returns / rolling_max) - 1
-    max_drawdown = drawdown.min().item() 
-    
-    # 2. Sharpe Ratio Annuel
-    annualization_factor = np.sqrt(252) # Facteur d'annualisation pour les jours de trading
-    
-    # Calcul de la moyenne des rendements annualisée
-    avg_return = daily_returns.mean().item() * 252
-    # Calcul de la volatilité annualisée (Écart-type)
-    volatility = daily_returns.std().item() * annualization_factor
-    
-    volatility = float(volatility) 
-    
-    # Calcul du Sharpe Ratio
-    if volatility == 0:
-        sharpe_ratio = 0.0
-    else:
-        # Formule du Sharpe Ratio: (Rendement annuel - Taux sans risque) / Volatilité annuelle
-        sharpe_ratio = float((avg_return - risk_free_rate) / volatility)
-        
+    max_drawdown, sharpe_ratio = performance_metrics(as_float_array(returns.to_numpy()), risk_free_rate)
+
     return {
         "Max Drawdown": f"{max_drawdown * 100:.2f} %", 
         "Sharpe Ratio (Annuel)": f"{sharpe_ratio:.2f}"
@@ -0,0 +1,244 @@
+# src/quant_a/universe_backtest.py
+"""
+Backtest d'une stratégie enregistrée (STRATEGY_REGISTRY) sur un univers de tickers.
+
+Les prix sont copiés une seule fois dans un segment de mémoire partagée (un ticker par
+ligne, lignes contiguës) ; les processus du pool s'y attachent sans copie et traitent
+les tickers par paquets. Une série invalide (vide, trop courte) est isolée dans le
+tableau de résultats au lieu d'interrompre l'exécution.
+"""
+import os
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from src.quant_a.strategy_core import STRATEGY_REGISTRY, performance_metrics
+
+RESULT_COLUMNS = ["Status", "Error", "Days", "Final Value", "Total Return", "Sharpe Ratio", "Max Drawdown"]
+
+# Index des courbes écrites dans equity_dir (ticker -> fichier .npy)
+EQUITY_MANIFEST = "manifest.json"
+
+# État propre à chaque processus (rempli par _init_worker)
+_WORKER = {}
+
+
+def _init_worker(shm_name: str, shape: tuple, strategy_name: str, params: dict,
+                 risk_free_rate: float, equity_dir) -> None:
+    """Attache le processus au segment de mémoire partagée et prépare ses tampons de travail."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    n_days = shape[1]
+    _WORKER.update(
+        shm=shm,
+        prices=np.ndarray(shape, dtype=np.float64, buffer=shm.buf),
+        strategy=STRATEGY_REGISTRY[strategy_name],
+        params=params,
+        risk_free_rate=risk_free_rate,
+        equity_dir=equity_dir,
+        out=np.empty(n_days),
+        metrics_work=np.empty((3, n_days)),
+    )
+
+
+def _backtest_row(row: int, ticker: str) -> dict:
+    """Backtest d'un ticker (ligne `row` de la matrice partagée) ; les erreurs sont capturées."""
+    result = {"Ticker": ticker, "Status": "ok", "Error": "", "Days": 0}
+    try:
+        series = _WORKER["prices"][row]
+        valid = np.isfinite(series)
+        n_days = int(valid.sum())
+        result["Days"] = n_days
+
+        if n_days == 0:
+            raise ValueError("Série vide")
+
+        strategy = _WORKER["strategy"]
+        params = _WORKER["params"]
+        min_length = strategy["min_length"](params)
+        if n_days < min_length:
+            raise ValueError(f"Série trop courte ({n_days} jours < {min_length} requis)")
+
+        positions = np.flatnonzero(valid)
+        prices = series[positions] if n_days < len(series) else series
+        values = strategy["func"](prices, out=_WORKER["out"][:n_days], **params)
+
+        defined = values[~np.isnan(values)]
+        final_value = float(defined[-1]) if len(defined) else np.nan
+        if n_days >= 2:
+            max_drawdown, sharpe_ratio = performance_metrics(
+                values, _WORKER["risk_free_rate"], work=_WORKER["metrics_work"][:, :n_days])
+        else:
+            max_drawdown, sharpe_ratio = np.nan, np.nan
+
+        result.update({
+            "Final Value": final_value,
+            "Total Return": final_value / 100.0 - 1.0,
+            "Sharpe Ratio": sharpe_ratio,
+            "Max Drawdown": max_drawdown,
+        })
+
+        if _WORKER["equity_dir"]:
+            equity = np.full(len(series), np.nan)
+            equity[positions] = values
+            np.save(os.path.join(_WORKER["equity_dir"], f"{_equity_file_stem(ticker)}.npy"), equity)
+
+    except Exception as e:
+        # Isolation des erreurs : le ticker est marqué en échec, le reste de l'univers continue
+        result.update(Status="error", Error=str(e))
+
+    return result
+
+
+def _backtest_chunk(chunk: list) -> list:
+    """Traite un paquet de (ligne, ticker)."""
+    return [_backtest_row(row, ticker) for row, ticker in chunk]
+
+
+def _equity_file_stem(ticker: str) -> str:
+    """Nom de fichier sûr pour un ticker (ex: 'BRK/B' -> 'BRK_B')."""
+    return "".join(c if c.isalnum() or c in "-._^" else "_" for c in str(ticker))
+
+
+def run_universe_backtest(prices: pd.DataFrame, strategy_name: str, params: dict = None,
+                          risk_free_rate: float = 0.04, max_workers: int = None, chunk_size: int = None,
+                          equity_dir: str = None, progress_callback=None) -> pd.DataFrame:
+    """
+    Exécute une stratégie enregistrée sur chaque colonne de `prices` en parallèle.
+
+    :param prices: pd.DataFrame des prix (index = dates, colonnes = tickers). Les NaN
+        (ticker non coté sur une partie de la période) sont ignorés ticker par ticker.
+    :param strategy_name: Nom d'une stratégie de STRATEGY_REGISTRY ('Buy-and-Hold', 'MA Crossover', ...).
+    :param params: Paramètres de la stratégie (complétés par les valeurs par défaut).
+    :param risk_free_rate: Taux sans risque annuel pour le Sharpe Ratio.
+    :param max_workers: Nombre de processus (None = nombre de CPU ; 1 = exécution locale sans pool).
+    :param chunk_size: Nombre de tickers par tâche (None = ~4 tâches par processus).
+    :param equity_dir: Dossier où écrire les courbes de valeur (un .npy par ticker réussi, dates.npy
+        et manifest.json associant chaque ticker à son fichier).
+    :param progress_callback: Fonction optionnelle appelée avec (tickers_traités, total).
+    :return: pd.DataFrame des résultats (index = ticker, colonnes RESULT_COLUMNS).
+    """
+    if strategy_name not in STRATEGY_REGISTRY:
+        raise ValueError(f"Stratégie inconnue : {strategy_name}. Disponibles : {list(STRATEGY_REGISTRY)}")
+
+    tickers = list(prices.columns)
+    strategy_params = {**STRATEGY_REGISTRY[strategy_name]["default_params"], **(params or {})}
+    if not tickers:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    if equity_dir:
+        os.makedirs(equity_dir, exist_ok=True)
+        np.save(os.path.join(equity_dir, "dates.npy"), prices.index.to_numpy(dtype="datetime64[ns]"))
+
+    # Un ticker par ligne : chaque série est contiguë en mémoire
+    shape = (len(tickers), len(prices))
+    shm = shared_memory.SharedMemory(create=True, size=max(8 * shape[0] * shape[1], 1))
+    try:
+        shared_prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        shared_prices[:] = prices.to_numpy(dtype=np.float64).T
+
+        max_workers = max_workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, math.ceil(len(tickers) / (max_workers * 4)))
+        tasks = list(enumerate(tickers))
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+        init_args = (shm.name, shape, strategy_name, strategy_params, risk_free_rate, equity_dir)
+
+        results = []
+        if max_workers == 1:
+            _init_worker(*init_args)
+            try:
+                for chunk in chunks:
+                    results.extend(_backtest_chunk(chunk))
+                    if progress_callback:
+                        progress_callback(len(results), len(tickers))
+            finally:
+                _WORKER.pop("shm").close()
+                _WORKER.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=init_args) as pool:
+                futures = {pool.submit(_backtest_chunk, chunk): chunk for chunk in chunks}
+                for future in as_completed(futures):
+                    try:
+                        results.extend(future.result())
+                    except Exception as e:
+                        # Échec du processus lui-même : tous les tickers du paquet sont marqués en échec
+                        results.extend({"Ticker": ticker, "Status": "error", "Error": str(e), "Days": 0}
+                                       for _, ticker in futures[future])
+                    if progress_callback:
+                        progress_callback(len(results), len(tickers))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results_df = pd.DataFrame(results).set_index("Ticker").reindex(tickers)
+
+    if equity_dir:
+        _write_equity_manifest(equity_dir, results_df)
+
+    return results_df.reindex(columns=RESULT_COLUMNS)
+
+
+def _write_equity_manifest(equity_dir: str, results_df: pd.DataFrame) -> None:
+    """
+    Écrit le manifeste des courbes de l'exécution (tickers réussis uniquement) et supprime les
+    courbes laissées par une exécution précédente pour les tickers en échec.
+    """
+    manifest = {}
+    for ticker, status in results_df["Status"].items():
+        file_name = f"{_equity_file_stem(ticker)}.npy"
+        if status == "ok":
+            manifest[str(ticker)] = file_name
+        else:
+            stale_path = os.path.join(equity_dir, file_name)
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+
+    with open(os.path.join(equity_dir, EQUITY_MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_equity_curves(equity_dir: str, tickers=None) -> pd.DataFrame:
+    """
+    Recharge les courbes de valeur écrites par la dernière exécution de run_universe_backtest.
+
+    :param equity_dir: Dossier passé à run_universe_backtest.
+    :param tickers: Liste de tickers à charger (None = tous ceux du manifeste). Les tickers absents
+        du manifeste (en échec ou hors univers) sont ignorés.
+    :return: pd.DataFrame (index = dates, colonnes = tickers d'origine).
+    """
+    dates = pd.DatetimeIndex(np.load(os.path.join(equity_dir, "dates.npy")))
+    with open(os.path.join(equity_dir, EQUITY_MANIFEST)) as f:
+        manifest = json.load(f)
+    if tickers is None:
+        tickers = list(manifest)
+
+    curves = {}
+    for ticker in tickers:
+        file_name = manifest.get(str(ticker))
+        if file_name is not None:
+            curves[ticker] = np.load(os.path.join(equity_dir, file_name))
+    return pd.DataFrame(curves, index=dates)
+
+
+if __name__ == '__main__':
+    # Test du module sur un univers synthétique (avec deux séries invalides)
+    n_days, n_tickers = 750, 200
+    dates = pd.bdate_range(start='2022-01-01', periods=n_days)
+    rng = np.random.default_rng(0)
+    universe = pd.DataFrame(
+        100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, size=(n_days, n_tickers)), axis=0)),
+        index=dates, columns=[f"TICK{i:03d}" for i in range(n_tickers)]
+    )
+    universe["EMPTY"] = np.nan
+    universe["SHORT"] = np.nan
+    universe.iloc[-100:, universe.columns.get_loc("SHORT")] = 100.0
+
+    results = run_universe_backtest(
+        universe, "MA Crossover", {'short_window': 20, 'long_window': 150},
+        progress_callback=lambda done, total: print(f"\rProgression : {done}/{total}", end="")
+    )
+    print()
+    print(results.tail(4))
+    print(results[results["Status"] == "ok"][["Total Return", "Sharpe Ratio", "Max Drawdown"]].describe())
@@ -0,0 +1,291 @@
+# src/quant_b/covariance_engine.py
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
+
+# Dossier de persistance de l'état des estimateurs entre deux exécutions (QUANT_STATE_DIR pour le remplacer,
+# ex: tests de charge sur données rejouées, qui ne doivent pas toucher à l'état de production)
+STATE_DIR_ENV = "QUANT_STATE_DIR"
+STATE_DIR = os.environ.get(STATE_DIR_ENV) or os.path.join("data", "cache")
+
+# Nombre maximal de fichiers d'état EWMA conservés (les moins récemment écrits sont supprimés)
+MAX_STATE_FILES = 8
+
+# Demi-vie par défaut (en jours de bourse). RiskMetrics utilise lambda = 0.94, soit ~11 jours.
+DEFAULT_HALFLIFE = 11.0
+
+# Écart maximal (en valeur absolue) toléré sur les corrélations avant de recalculer l'ordre du clustering
+CLUSTER_ORDER_TOLERANCE = 0.05
+
+
+class EWMACovarianceEstimator:
+    """
+    Estimateur de covariance / corrélation à pondération exponentielle (style RiskMetrics).
+
+    La matrice est mise à jour en place par une mise à jour de rang 1 à chaque nouvelle barre
+    (coût O(N²) au lieu de O(T·N²) pour un recalcul complet) :
+        S_t = lambda * S_{t-1} + (1 - lambda) * r_t r_t'
+        W_t = lambda * W_{t-1} + (1 - lambda)
+        Sigma_t = S_t / W_t
+    La normalisation par W_t corrige le biais du démarrage à zéro (équivalent à ewm(adjust=True)).
+    Les rendements sont supposés de moyenne nulle, comme dans RiskMetrics.
+    """
+
+    def __init__(self, columns, halflife: float = DEFAULT_HALFLIFE):
+        """
+        :param columns: Liste des tickers (ordre des lignes/colonnes de la matrice).
+        :param halflife: Demi-vie de la pondération exponentielle (en barres).
+        """
+        if halflife <= 0:
+            raise ValueError("La demi-vie doit être strictement positive.")
+
+        self.columns = list(columns)
+        self.halflife = float(halflife)
+        self.decay = 0.5 ** (1.0 / self.halflife)
+
+        n_assets = len(self.columns)
+        self._cov_sum = np.zeros((n_assets, n_assets))
+        self._weight_sum = 0.0
+        self._outer_buffer = np.empty((n_assets, n_assets))
+        self.last_timestamp = None
+        self.n_updates = 0
+
+        # Dernière barre non encore clôturée (prise en compte sans être intégrée à l'état)
+        self._pending_returns = None
+
+        # Cache de l'ordre des actifs issu du clustering hiérarchique
+        self._cluster_order = None
+        self._cluster_reference = None
+
+    def update(self, returns_row) -> None:
+        """
+        Intègre une nouvelle barre de rendements dans l'état (mise à jour de rang 1 en place).
+
+        :param returns_row: Vecteur des rendements de la barre (même ordre que self.columns).
+        """
+        r = np.asarray(returns_row, dtype=float)
+        if not np.all(np.isfinite(r)):
+            return
+
+        np.multiply.outer(r, r, out=self._outer_buffer)
+        self._cov_sum *= self.decay
+        self._outer_buffer *= (1.0 - self.decay)
+        self._cov_sum += self._outer_buffer
+        self._weight_sum = self.decay * self._weight_sum + (1.0 - self.decay)
+        self.n_updates += 1
+
+    def update_from_returns(self, daily_returns: pd.DataFrame, last_bar_is_final: bool = False) -> int:
+        """
+        Intègre uniquement les barres postérieures à la dernière barre déjà traitée.
+
+        Par défaut, la dernière ligne est considérée comme provisoire (séance en cours) :
+        elle est prise en compte dans les estimations mais n'est intégrée à l'état qu'au
+        rafraîchissement suivant, une fois qu'une barre plus récente est apparue.
+
+        :param daily_returns: pd.DataFrame des rendements quotidiens (colonnes = tickers).
+        :param last_bar_is_final: True si la dernière ligne est une barre clôturée.
+        :return: Nombre de barres intégrées à l'état.
+        """
+        if daily_returns.empty:
+            return 0
+
+        # Recherche dichotomique de la première barre nouvelle (index trié), puis sélection des colonnes
+        start = 0
+        if self.last_timestamp is not None:
+            start = daily_returns.index.searchsorted(self.last_timestamp, side='right')
+        returns = daily_returns.iloc[start:][self.columns]
+
+        if returns.empty:
+            self._pending_returns = None
+            return 0
+
+        values = np.ascontiguousarray(returns.to_numpy(dtype=float))
+        n_final = len(values) if last_bar_is_final else len(values) - 1
+
+        for row in values[:n_final]:
+            self.update(row)
+
+        if n_final > 0:
+            self.last_timestamp = returns.index[n_final - 1]
+
+        self._pending_returns = None if last_bar_is_final else values[-1]
+        return n_final
+
+    def covariance_matrix(self) -> np.ndarray:
+        """
+        Retourne la matrice de covariance EWMA courante (rendements quotidiens).
+
+        :return: np.ndarray (N x N), remplie de NaN si aucune barre n'a été observée.
+        """
+        cov_sum = self._cov_sum
+        weight_sum = self._weight_sum
+
+        if self._pending_returns is not None and np.all(np.isfinite(self._pending_returns)):
+            r = self._pending_returns
+            cov_sum = self.decay * cov_sum + (1.0 - self.decay) * np.multiply.outer(r, r)
+            weight_sum = self.decay * weight_sum + (1.0 - self.decay)
+
+        if weight_sum == 0:
+            return np.full_like(self._cov_sum, np.nan)
+
+        return cov_sum / weight_sum
+
+    def covariance(self) -> pd.DataFrame:
+        """Matrice de covariance EWMA courante sous forme de pd.DataFrame."""
+        return pd.DataFrame(self.covariance_matrix(), index=self.columns, columns=self.columns)
+
+    def correlation(self) -> pd.DataFrame:
+        """Matrice de corrélation EWMA courante sous forme de pd.DataFrame."""
+        cov = self.covariance_matrix()
+        std = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.multiply.outer(std, std)
+        np.fill_diagonal(corr, 1.0)
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def portfolio_volatility(self, weights: np.ndarray, annualization_factor: int = 252) -> float:
+        """
+        Volatilité annualisée du portefeuille à partir de la covariance EWMA (sqrt(w' Sigma w)).
+
+        :param weights: np.ndarray des pondérations des actifs.
+        :param annualization_factor: Nombre de barres par an.
+        :return: Volatilité annualisée (float).
+        """
+        weights = np.asarray(weights, dtype=float)
+        variance = weights @ self.covariance_matrix() @ weights
+        return float(np.sqrt(max(variance, 0.0) * annualization_factor))
+
+    def clustered_correlation(self, tolerance: float = CLUSTER_ORDER_TOLERANCE) -> pd.DataFrame:
+        """
+        Matrice de corrélation dont les actifs sont ordonnés par clustering hiérarchique.
+
+        L'ordre est mis en cache et n'est recalculé que si une corrélation a bougé de plus
+        de `tolerance` depuis le dernier clustering.
+
+        :param tolerance: Variation maximale tolérée avant recalcul de l'ordre.
+        :return: pd.DataFrame de la matrice de corrélation réordonnée.
+        """
+        corr = self.correlation()
+        corr_values = corr.to_numpy()
+
+        if np.isnan(corr_values).any():
+            return corr
+
+        if (self._cluster_order is None
+                or np.max(np.abs(corr_values - self._cluster_reference)) > tolerance):
+            self._cluster_order = self._compute_cluster_order(corr_values)
+            self._cluster_reference = corr_values.copy()
+
+        ordered = [self.columns[i] for i in self._cluster_order]
+        return corr.loc[ordered, ordered]
+
+    @staticmethod
+    def _compute_cluster_order(corr_values: np.ndarray) -> np.ndarray:
+        """Ordre des feuilles d'un clustering hiérarchique (distance sqrt((1 - rho) / 2))."""
+        if len(corr_values) < 3:
+            return np.arange(len(corr_values))
+
+        distance = np.sqrt(np.clip((1.0 - corr_values) / 2.0, 0.0, None))
+        np.fill_diagonal(distance, 0.0)
+        condensed = squareform(distance, checks=False)
+        return leaves_list(linkage(condensed, method='average'))
+
+    def save(self, path: str) -> None:
+        """
+        Sauvegarde l'état de l'estimateur sur disque (format .npz).
+
+        :param path: Chemin du fichier d'état.
+        """
+        last_timestamp = "" if self.last_timestamp is None else pd.Timestamp(self.last_timestamp).isoformat()
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            np.savez(
+                path,
+                columns=np.array(self.columns),
+                halflife=self.halflife,
+                cov_sum=self._cov_sum,
+                weight_sum=self._weight_sum,
+                n_updates=self.n_updates,
+                last_timestamp=last_timestamp,
+            )
+        except OSError as e:
+            # Gestion d'erreur (Robustness) : l'état sera simplement recalculé à la prochaine exécution
+            print(f"Erreur lors de la sauvegarde de l'état EWMA ({path}) : {e}")
+
+    @classmethod
+    def load(cls, path: str, columns, halflife: float = DEFAULT_HALFLIFE):
+        """
+        Recharge l'état depuis le disque, ou crée un nouvel estimateur si le fichier est
+        absent, illisible ou incompatible (tickers ou demi-vie différents).
+
+        :param path: Chemin du fichier d'état.
+        :param columns: Liste des tickers attendus.
+        :param halflife: Demi-vie attendue.
+        :return: EWMACovarianceEstimator.
+        """
+        estimator = cls(columns, halflife)
+        if not os.path.exists(path):
+            return estimator
+
+        try:
+            with np.load(path) as state:
+                if list(state['columns']) != estimator.columns or float(state['halflife']) != estimator.halflife:
+                    return estimator
+                estimator._cov_sum[:] = state['cov_sum']
+                estimator._weight_sum = float(state['weight_sum'])
+                estimator.n_updates = int(state['n_updates'])
+                last_timestamp = str(state['last_timestamp'])
+                estimator.last_timestamp = pd.Timestamp(last_timestamp) if last_timestamp else None
+        except Exception as e:
+            # Gestion d'erreur (Robustness) : un état corrompu est simplement ignoré
+            print(f"Erreur lors du chargement de l'état EWMA ({path}) : {e}")
+            return cls(columns, halflife)
+
+        return estimator
+
+
+def get_state_path(columns, halflife: float, period: str) -> str:
+    """
+    Chemin du fichier d'état pour un univers, une demi-vie et une période donnés.
+    L'univers est résumé par une empreinte courte (la liste complète des tickers est stockée dans le
+    fichier et vérifiée par load), pour rester sous la limite de longueur des noms de fichiers.
+    """
+    universe_id = hashlib.sha1("\0".join(map(str, columns)).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(STATE_DIR, f"ewma_{universe_id}_{period}_hl{halflife:g}.npz")
+
+
+def prune_state_files(max_files: int = MAX_STATE_FILES, state_dir: str = None) -> None:
+    """
+    Supprime les fichiers d'état EWMA les plus anciens au-delà de `max_files`
+    (une demi-vie ou une période nouvelle crée un nouveau fichier à chaque fois).
+    """
+    state_dir = state_dir or STATE_DIR
+    try:
+        paths = [os.path.join(state_dir, f) for f in os.listdir(state_dir)
+                 if f.startswith("ewma_") and f.endswith(".npz")]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[max_files:]:
+            os.remove(path)
+    except OSError as e:
+        # Gestion d'erreur (Robustness) : le nettoyage ne doit jamais bloquer le dashboard
+        print(f"Erreur lors du nettoyage des états EWMA ({state_dir}) : {e}")
+
+
+if __name__ == '__main__':
+    # Vérification : la mise à jour incrémentale coïncide avec pandas ewm (moyenne nulle)
+    dates = pd.date_range(start='2024-01-01', periods=300)
+    returns_test = pd.DataFrame(np.random.normal(0, 0.01, size=(300, 4)), index=dates, columns=list("ABCD"))
+
+    estimator = EWMACovarianceEstimator(returns_test.columns, halflife=20)
+    estimator.update_from_returns(returns_test.iloc[:200], last_bar_is_final=True)
+    estimator.update_from_returns(returns_test, last_bar_is_final=True)
+
+    values = returns_test.to_numpy()
+    weights_ewm = 0.5 ** (np.arange(len(values))[::-1] / 20)
+    expected = (values * weights_ewm[:, None]).T @ values / weights_ewm.sum()
+
+    print(f"Écart max vs calcul direct : {np.max(np.abs(estimator.covariance_matrix() - expected)):.2e}")
+    print(estimator.clustered_correlation().round(2))
@@ -1,17 +1,50 @@
 # src/quant_b/dashboard_b.py
+import threading
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
 from .config import TICKERS_B, COLORS_B
 from .data_handler_b import get_historical_data_multi, get_realtime_prices_multi
-from .portfolio_engine import calculate_portfolio_metrics, calculate_portfolio_value
+from .whatif_engine import PortfolioWhatIfEngine
+from .covariance_engine import EWMACovarianceEstimator, DEFAULT_HALFLIFE, MAX_STATE_FILES, get_state_path, prune_state_files
+
+# Les estimateurs EWMA sont partagés entre les sessions : les mises à jour sont sérialisées
+_EWMA_LOCK = threading.Lock()
 
 @st.cache_data(ttl=300)
 def load_data_b(period):
     """Fonction sécurisée pour charger les données historiques multi-actifs."""
     return get_historical_data_multi(period=period)
 
+def get_data_version(prices: pd.DataFrame) -> tuple:
+    """
+    Identifiant bon marché de la version des données (O(N), pas de passage sur l'historique) :
+    dernière date, dimensions et dernière ligne de prix (révisée en cours de séance).
+    """
+    if prices.empty:
+        return (None, prices.shape, b"")
+    return (prices.index[-1], prices.shape, prices.iloc[-1].to_numpy(dtype=np.float64).tobytes())
+
+@st.cache_resource(max_entries=8)
+def load_whatif_engine(period, data_version, _prices):
+    """
+    Moteur what-if (rendements, moyennes, covariance en cache) pour une version des données.
+    Partagé entre les sessions et reconstruit dès que load_data_b renvoie de nouveaux prix :
+    les mouvements des curseurs de poids ne recalculent plus rien sur l'historique complet.
+
+    :param data_version: Clé de cache issue de get_data_version (les prix eux-mêmes ne sont pas hachés).
+    """
+    return PortfolioWhatIfEngine(_prices)
+
+@st.cache_resource(max_entries=MAX_STATE_FILES)
+def load_ewma_estimator(columns, halflife, period):
+    """
+    Estimateur EWMA conservé en mémoire entre les rafraîchissements (état rechargé depuis le disque).
+    Le cache en mémoire et les fichiers d'état sont bornés à MAX_STATE_FILES combinaisons.
+    """
+    return EWMACovarianceEstimator.load(get_state_path(columns, halflife, period), columns, halflife)
+
 def run_quant_b_dashboard():
     """Contient la logique de l'interface pour le module Portefeuille Multi-Actifs."""
     
@@ -53,14 +86,65 @@ def run_quant_b_dashboard():
             step=0.1,
             format="%.2f"
         ) / 100.0 # Convertir en décimal
+
+        use_ewma = st.checkbox("Covariance EWMA (RiskMetrics) pour la volatilité et les corrélations", value=True)
+        halflife = st.number_input(
+            "Demi-vie EWMA (jours) :",
+            min_value=1.0,
+            max_value=252.0,
+            value=DEFAULT_HALFLIFE,
+            step=1.0,
+            disabled=not use_ewma
+        )
     
     prices_df = load_data_b(selected_period)
+    engine = load_whatif_engine(selected_period, get_data_version(prices_df), prices_df)
 
     if prices_df.empty:
         st.error("⚠️ Impossible de charger les données pour le portefeuille. Vérifiez la connexion ou les tickers.")
         return
 
-    # --- 3. Définition des Pondérations ---
+    # --- 3. Graphique 1 : Évolution des Prix Bruts (NOUVEAU) ---
+    st.markdown("#### 📉 Évolution des Prix Quotidiens (Valeurs Brutes)")
+    
+    # Préparation des données pour le graphique des prix bruts
+    # Utilisation du DataFrame 'prices_df' tel quel (prix bruts)
+    prices_raw_chart_data = prices_df.reset_index().melt(
+        id_vars='Date', 
+        var_name='Actif', 
+        value_name='Prix Brut ($)'
+    )
+    
+    # Création du Plotly Chart (Utilisation des couleurs demandées)
+    fig_raw = px.line(
+        prices_raw_chart_data,
+        x='Date',
+        y='Prix Brut ($)',
+        color='Actif',
+        color_discrete_map=COLORS_B, # Applique les couleurs configurées
+        title="Prix Bruts des Actifs (sans normalisation)"
+    )
+    fig_raw.update_layout(hovermode="x unified")
+    st.plotly_chart(fig_raw, use_container_width=True)
+
+    st.markdown("---")
+
+    portfolio_panel(engine, selected_strategy, selected_period, selected_period_label,
+                    risk_free_rate, use_ewma, halflife)
+
+
+@st.fragment
+def portfolio_panel(engine, selected_strategy, selected_period, selected_period_label,
+                    risk_free_rate, use_ewma, halflife):
+    """
+    Pondérations, corrélations, métriques et valeur cumulée du portefeuille.
+
+    Fragment Streamlit : un mouvement des curseurs de poids ne réexécute que ce panneau
+    (calculs O(N²) du moteur what-if), sans retracer le graphique des prix bruts.
+    """
+    prices_df = engine.prices
+
+    # --- 4. Définition des Pondérations ---
     weights = []
     
     if selected_strategy == "Equal Weight (Poids Égaux)":
@@ -90,35 +174,24 @@ def run_quant_b_dashboard():
         else:
             weights = np.array(weights_raw) / 100.0 # Normalise simplement à 1.0
 
-
-    # --- 4. Graphique 1 : Évolution des Prix Bruts (NOUVEAU) ---
-    st.markdown("#### 📉 Évolution des Prix Quotidiens (Valeurs Brutes)")
-    
-    # Préparation des données pour le graphique des prix bruts
-    # Utilisation du DataFrame 'prices_df' tel quel (prix bruts)
-    prices_raw_chart_data = prices_df.reset_index().melt(
-        id_vars='Date', 
-        var_name='Actif', 
-        value_name='Prix Brut ($)'
-    )
-    
-    # Création du Plotly Chart (Utilisation des couleurs demandées)
-    fig_raw = px.line(
-        prices_raw_chart_data,
-        x='Date',
-        y='Prix Brut ($)',
-        color='Actif',
-        color_discrete_map=COLORS_B, # Applique les couleurs configurées
-        title="Prix Bruts des Actifs (sans normalisation)"
-    )
-    fig_raw.update_layout(hovermode="x unified")
-    st.plotly_chart(fig_raw, use_container_width=True)
-
-    st.markdown("---")
-
     # --- 5. Matrice de Corrélation ---
-    st.markdown("#### 🔗 Matrice de Corrélation")
-    metrics = calculate_portfolio_metrics(prices_df, weights, risk_free_rate=risk_free_rate)
+    # La valeur cumulée et le Max Drawdown (calcul sur tout l'historique) ne sont calculés que s'ils sont affichés
+    show_performance = st.checkbox("Afficher la valeur cumulée et le Max Drawdown", value=True)
+
+    if use_ewma:
+        st.markdown(f"#### 🔗 Matrice de Corrélation (EWMA, demi-vie {halflife:g} jours, ordonnée par clustering)")
+        columns = tuple(prices_df.columns)
+        estimator = load_ewma_estimator(columns, halflife, selected_period)
+        with _EWMA_LOCK:
+            n_updates_before = estimator.n_updates
+            metrics = engine.metrics(weights, risk_free_rate=risk_free_rate, cov_estimator=estimator,
+                                     include_drawdown=show_performance)
+            if estimator.n_updates != n_updates_before:
+                estimator.save(get_state_path(columns, halflife, selected_period))
+                prune_state_files()
+    else:
+        st.markdown("#### 🔗 Matrice de Corrélation")
+        metrics = engine.metrics(weights, risk_free_rate=risk_free_rate, include_drawdown=show_performance)
     
     st.dataframe(metrics["Correlation Matrix"].style.background_gradient(cmap='coolwarm', axis=None).format("{:.2f}"))
     
@@ -136,15 +209,18 @@ def run_quant_b_dashboard():
         st.metric("Max Drawdown", metrics["Max Drawdown"])
 
     st.markdown("---")
+
+    if not show_performance:
+        return
     
     # --- 7. Graphique 2 : Valeur Cumulée Normalisée (CORRECTION) ---
     st.markdown("#### 📈 Comparaison de Performance (Valeur Cumulée Base 100)")
     
-    # Calcul de la valeur cumulée du portefeuille
-    portfolio_value = calculate_portfolio_value(prices_df, weights)
+    # Calcul de la valeur cumulée du portefeuille (en cache dans le moteur pour ces poids)
+    portfolio_value = engine.portfolio_value(weights)
     
-    # Normalisation des actifs individuels pour la comparaison
-    normalized_assets = (prices_df / prices_df.iloc[0]) * 100.0
+    # Normalisation des actifs individuels pour la comparaison (indépendante des poids, en cache)
+    normalized_assets = engine.normalized_prices
     
     # Création du DataFrame final pour le graphique (CONTIENT TOUS LES ACTIFS + PORTEFEUILLE)
     chart_data = normalized_assets.copy()
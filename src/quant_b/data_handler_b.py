@@ -2,11 +2,16 @@
 import yfinance as yf
 import pandas as pd
 from .config import TICKERS_B
+from src.replay_provider import get_replay_provider
 
 def get_historical_data_multi(period="1y"):
     """
     Récupère les prix ajustés historiques pour tous les tickers du portefeuille.
     """
+    replay = get_replay_provider()
+    if replay is not None:
+        return replay.get_historical_data_multi(TICKERS_B, period=period)
+
     try:
         data = yf.download(TICKERS_B, period=period, interval="1d", progress=False)
 
@@ -31,6 +36,10 @@ def get_realtime_prices_multi():
     """
     Récupère le prix actuel pour chaque actif du portefeuille.
     """
+    replay = get_replay_provider()
+    if replay is not None:
+        return replay.get_realtime_prices_multi(TICKERS_B)
+
     prices = {}
     for ticker in TICKERS_B:
         try:
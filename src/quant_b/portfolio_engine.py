@@ -2,13 +2,16 @@
 import pandas as pd
 import numpy as np
 
-def calculate_portfolio_metrics(prices: pd.DataFrame, weights: np.ndarray, risk_free_rate=0.04) -> dict:
+def calculate_portfolio_metrics(prices: pd.DataFrame, weights: np.ndarray, risk_free_rate=0.04, cov_estimator=None) -> dict:
     """
     Calcule les métriques de performance et de risque pour le portefeuille donné.
 
     :param prices: pd.DataFrame des prix des actifs (colonnes = tickers).
     :param weights: np.ndarray des pondérations des actifs (doit sommer à 1).
     :param risk_free_rate: Taux sans risque annuel.
+    :param cov_estimator: EWMACovarianceEstimator optionnel. S'il est fourni, la volatilité et la
+        matrice de corrélation (ordonnée par clustering) proviennent de l'estimateur EWMA,
+        mis à jour uniquement avec les nouvelles barres.
     :return: dict des métriques du portefeuille.
     """
     if prices.empty:
@@ -23,7 +26,11 @@ def calculate_portfolio_metrics(prices: pd.DataFrame, weights: np.ndarray, risk_
     # 3. Métriques annualisées
     annualization_factor = 252  # Jours de trading par an
     annual_return = portfolio_daily_returns.mean() * annualization_factor
-    annual_volatility = portfolio_daily_returns.std() * np.sqrt(annualization_factor)
+    if cov_estimator is not None:
+        cov_estimator.update_from_returns(daily_returns)
+        annual_volatility = cov_estimator.portfolio_volatility(weights, annualization_factor)
+    else:
+        annual_volatility = portfolio_daily_returns.std() * np.sqrt(annualization_factor)
     
     # 4. Sharpe Ratio
     if annual_volatility == 0:
@@ -38,7 +45,10 @@ def calculate_portfolio_metrics(prices: pd.DataFrame, weights: np.ndarray, risk_
     max_drawdown = drawdown.min().item()
 
     # 6. Matrice de Corrélation
-    correlation_matrix = daily_returns.corr()
+    if cov_estimator is not None:
+        correlation_matrix = cov_estimator.clustered_correlation()
+    else:
+        correlation_matrix = daily_returns.corr()
     
     return {
         "Annualized Return": f"{annual_return * 100:.2f} %",
@@ -0,0 +1,175 @@
+# src/quant_b/whatif_engine.py
+"""
+Moteur « what-if » du module Quant B : réponses instantanées aux changements de pondérations.
+
+Les quantités indépendantes des poids (matrice des rendements R, vecteur des moyennes mu,
+matrice de covariance Sigma, corrélations, prix normalisés) sont calculées une seule fois
+par version des données. Pour de nouveaux poids w :
+    rendement annuel   = 252 * mu'w                 (O(N))
+    volatilité annuelle = sqrt(252 * w' Sigma w)    (O(N²))
+La valeur cumulée et le Max Drawdown (O(T·N)) ne sont calculés qu'à la demande, et mis en
+cache pour les derniers jeux de poids utilisés.
+"""
+from collections import OrderedDict
+import threading
+import numpy as np
+import pandas as pd
+
+ANNUALIZATION_FACTOR = 252  # Jours de trading par an
+
+# Nombre de jeux de poids dont la valeur cumulée reste en cache
+EQUITY_CACHE_SIZE = 16
+
+
+class PortfolioWhatIfEngine:
+    """Moments des rendements mis en cache pour une version donnée des prix."""
+
+    def __init__(self, prices: pd.DataFrame):
+        """
+        :param prices: pd.DataFrame des prix des actifs (colonnes = tickers).
+        """
+        self.prices = prices
+        self.columns = list(prices.columns)
+
+        # 1. Rendements quotidiens (calculés une seule fois) et matrice contiguë T x N
+        self.daily_returns = prices.pct_change().dropna()
+        self.returns_matrix = np.ascontiguousarray(self.daily_returns.to_numpy(dtype=np.float64))
+
+        # 2. Moments : moyenne et covariance d'échantillon (ddof=1, comme Series.std)
+        if len(self.returns_matrix) >= 2:
+            self.mean_returns = self.returns_matrix.mean(axis=0)
+            self.covariance = np.atleast_2d(np.cov(self.returns_matrix, rowvar=False, ddof=1))
+        else:
+            self.mean_returns = np.full(len(self.columns), np.nan)
+            self.covariance = np.full((len(self.columns), len(self.columns)), np.nan)
+
+        self._correlation_matrix = None
+        self._normalized_prices = None
+        self._equity_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def correlation_matrix(self) -> pd.DataFrame:
+        """Matrice de corrélation (indépendante des poids, calculée à la première demande)."""
+        if self._correlation_matrix is None:
+            self._correlation_matrix = self.daily_returns.corr()
+        return self._correlation_matrix
+
+    @property
+    def normalized_prices(self) -> pd.DataFrame:
+        """Prix des actifs normalisés en Base 100 (indépendants des poids)."""
+        if self._normalized_prices is None:
+            self._normalized_prices = (self.prices / self.prices.iloc[0]) * 100.0
+        return self._normalized_prices
+
+    def portfolio_moments(self, weights: np.ndarray) -> tuple:
+        """
+        Rendement et volatilité annualisés du portefeuille, à partir des moments en cache.
+
+        :param weights: np.ndarray des pondérations des actifs.
+        :return: tuple (rendement annuel, volatilité annuelle).
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        annual_return = float(self.mean_returns @ weights) * ANNUALIZATION_FACTOR
+        variance = float(weights @ self.covariance @ weights)
+        annual_volatility = float(np.sqrt(max(variance, 0.0) * ANNUALIZATION_FACTOR))
+        return annual_return, annual_volatility
+
+    def portfolio_value(self, weights: np.ndarray) -> pd.Series:
+        """
+        Valeur cumulée (Base 100) du portefeuille, calculée à la demande (O(T·N)) et mise en cache.
+
+        :param weights: np.ndarray des pondérations des actifs.
+        :return: pd.Series de la valeur cumulée (mêmes valeurs que calculate_portfolio_value).
+        """
+        if len(self.returns_matrix) == 0:
+            return pd.Series(dtype=float)
+
+        key = tuple(np.round(np.asarray(weights, dtype=np.float64), 12))
+        with self._lock:
+            if key in self._equity_cache:
+                self._equity_cache.move_to_end(key)
+                return self._equity_cache[key]
+
+        values = self.returns_matrix @ np.asarray(weights, dtype=np.float64)
+        values += 1.0
+        np.cumprod(values, out=values)
+        values /= values[0]
+        values *= 100.0
+        cumulative_value = pd.Series(values, index=self.daily_returns.index)
+
+        with self._lock:
+            self._equity_cache[key] = cumulative_value
+            while len(self._equity_cache) > EQUITY_CACHE_SIZE:
+                self._equity_cache.popitem(last=False)
+        return cumulative_value
+
+    def max_drawdown(self, weights: np.ndarray) -> float:
+        """Max Drawdown du portefeuille (réutilise la valeur cumulée en cache)."""
+        values = self.portfolio_value(weights).to_numpy()
+        if len(values) == 0:
+            return np.nan
+        return float((values / np.maximum.accumulate(values) - 1.0).min())
+
+    def metrics(self, weights: np.ndarray, risk_free_rate=0.04, cov_estimator=None, include_drawdown: bool = True) -> dict:
+        """
+        Métriques du portefeuille au même format que calculate_portfolio_metrics.
+
+        :param weights: np.ndarray des pondérations des actifs (doit sommer à 1).
+        :param risk_free_rate: Taux sans risque annuel.
+        :param cov_estimator: EWMACovarianceEstimator optionnel (volatilité et corrélations EWMA).
+        :param include_drawdown: False pour ne pas calculer le Max Drawdown (O(T·N)) ; il vaut alors "N/A".
+        :return: dict des métriques du portefeuille.
+        """
+        if self.prices.empty:
+            return {"Annualized Return": "N/A", "Annualized Volatility": "N/A", "Sharpe Ratio": "N/A"}
+
+        annual_return, annual_volatility = self.portfolio_moments(weights)
+
+        if cov_estimator is not None:
+            cov_estimator.update_from_returns(self.daily_returns)
+            annual_volatility = cov_estimator.portfolio_volatility(weights, ANNUALIZATION_FACTOR)
+            correlation_matrix = cov_estimator.clustered_correlation()
+        else:
+            correlation_matrix = self.correlation_matrix
+
+        if annual_volatility == 0:
+            sharpe_ratio = 0.0
+        else:
+            sharpe_ratio = (annual_return - risk_free_rate) / annual_volatility
+
+        max_drawdown = f"{self.max_drawdown(weights) * 100:.2f} %" if include_drawdown else "N/A"
+
+        return {
+            "Annualized Return": f"{annual_return * 100:.2f} %",
+            "Annualized Volatility": f"{annual_volatility * 100:.2f} %",
+            "Sharpe Ratio": f"{sharpe_ratio:.2f}",
+            "Max Drawdown": max_drawdown,
+            "Correlation Matrix": correlation_matrix
+        }
+
+
+if __name__ == '__main__':
+    # Vérification et micro-benchmark contre le recalcul complet
+    import timeit
+    from src.quant_b.portfolio_engine import calculate_portfolio_metrics, calculate_portfolio_value
+
+    n_days, n_assets = 1260, 200
+    dates = pd.bdate_range(start='2020-01-01', periods=n_days)
+    prices_test = pd.DataFrame(
+        100 * np.exp(np.cumsum(np.random.normal(0.0003, 0.015, size=(n_days, n_assets)), axis=0)),
+        index=dates, columns=[f"A{i:03d}" for i in range(n_assets)]
+    )
+    weights_test = np.random.dirichlet(np.ones(n_assets))
+
+    engine = PortfolioWhatIfEngine(prices_test)
+    reference = calculate_portfolio_metrics(prices_test, weights_test)
+    fast = engine.metrics(weights_test)
+    for key in ("Annualized Return", "Annualized Volatility", "Sharpe Ratio", "Max Drawdown"):
+        print(f"{key:<22} complet : {reference[key]:>10}   what-if : {fast[key]:>10}")
+    print(f"Écart max valeur cumulée : "
+          f"{np.max(np.abs(engine.portfolio_value(weights_test) - calculate_portfolio_value(prices_test, weights_test))):.2e}")
+
+    full_time = timeit.timeit(lambda: calculate_portfolio_metrics(prices_test, weights_test), number=20) / 20
+    fast_time = timeit.timeit(lambda: engine.metrics(np.random.dirichlet(np.ones(n_assets)), include_drawdown=False), number=20) / 20
+    print(f"\nRecalcul complet : {full_time * 1e3:.2f} ms / what-if (sans drawdown) : {fast_time * 1e3:.3f} ms")
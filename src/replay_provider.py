@@ -0,0 +1,218 @@
+# src/replay_provider.py
+"""
+Fournisseur de données « replay » : remplace yfinance par des données enregistrées ou synthétiques.
+
+Il expose la même interface que les data handlers des modules A et B (historique mono et
+multi-actifs, prix en temps réel) et permet :
+- des exécutions déterministes et hors ligne (tests, démonstrations, tests de charge) ;
+- d'avancer dans le temps en accéléré (horloge virtuelle : `speed` secondes de marché par seconde réelle) ;
+- de simuler la latence réseau de l'API (`latency`, en secondes, fixe ou intervalle aléatoire).
+
+Activation par variables d'environnement (lues par les data handlers) :
+    QUANT_DATA_PROVIDER=replay
+    QUANT_REPLAY_SOURCE=synthetic | <dossier de CSV> | <fichier CSV>
+    QUANT_REPLAY_SPEED=0          (0 = horloge figée)
+    QUANT_REPLAY_LATENCY=0.05     (ou "0.02,0.2" pour un intervalle)
+    QUANT_REPLAY_START=2024-06-03 (date virtuelle de départ, par défaut la dernière date disponible)
+"""
+import os
+import time
+import random
+import threading
+import numpy as np
+import pandas as pd
+
+PROVIDER_ENV = "QUANT_DATA_PROVIDER"
+SOURCE_ENV = "QUANT_REPLAY_SOURCE"
+SPEED_ENV = "QUANT_REPLAY_SPEED"
+LATENCY_ENV = "QUANT_REPLAY_LATENCY"
+START_ENV = "QUANT_REPLAY_START"
+
+# Tickers générés par défaut en mode synthétique (modules A et B)
+DEFAULT_SYNTHETIC_TICKERS = ["NVDA", "GOOGL", "AMZN", "JNJ"]
+
+# Durées des périodes yfinance supportées
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "3y": pd.DateOffset(years=3),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+
+class ReplayDataProvider:
+    """Sert des prix quotidiens enregistrés ou synthétiques à travers une horloge virtuelle."""
+
+    def __init__(self, prices: pd.DataFrame, start=None, speed: float = 0.0, latency=0.0, seed: int = None):
+        """
+        :param prices: pd.DataFrame des prix quotidiens (index = dates, colonnes = tickers).
+        :param start: Date virtuelle de départ (par défaut : dernière date disponible).
+        :param speed: Secondes de marché écoulées par seconde réelle (0 = horloge figée).
+        :param latency: Latence artificielle par appel, en secondes (float ou tuple (min, max)).
+        :param seed: Graine du générateur de latence aléatoire.
+        """
+        self.prices = prices.sort_index()
+        self.prices.index = pd.DatetimeIndex(self.prices.index).as_unit('ns').rename('Date')
+        self.start = pd.Timestamp(start) if start is not None else self.prices.index[-1]
+        self.speed = float(speed)
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._clock_origin = time.monotonic()
+
+    # --- Construction ---
+
+    @classmethod
+    def synthetic(cls, tickers=None, n_days: int = 5 * 252, end=None, seed: int = 0, **kwargs):
+        """
+        Prix synthétiques (mouvement brownien géométrique) reproductibles.
+
+        :param tickers: Liste de tickers (par défaut ceux des modules A et B).
+        :param n_days: Nombre de jours de bourse générés.
+        :param end: Dernière date générée (par défaut : aujourd'hui).
+        :param seed: Graine du générateur de prix.
+        """
+        tickers = list(tickers or DEFAULT_SYNTHETIC_TICKERS)
+        rng = np.random.default_rng(seed)
+        dates = pd.bdate_range(end=pd.Timestamp(end or pd.Timestamp.today()).normalize(), periods=n_days)
+        drift = rng.uniform(0.0001, 0.001, size=len(tickers))
+        volatility = rng.uniform(0.01, 0.03, size=len(tickers))
+        log_returns = rng.normal(drift, volatility, size=(n_days, len(tickers)))
+        start_prices = rng.uniform(50, 500, size=len(tickers))
+        prices = pd.DataFrame(start_prices * np.exp(np.cumsum(log_returns, axis=0)), index=dates, columns=tickers)
+        return cls(prices, **kwargs)
+
+    @classmethod
+    def from_path(cls, path: str, **kwargs):
+        """
+        Prix enregistrés : un fichier CSV large (colonne 'Date' + une colonne par ticker), ou un
+        dossier contenant un CSV par ticker (<TICKER>.csv avec les colonnes 'Date' et 'Price').
+        """
+        if os.path.isdir(path):
+            series = {}
+            for file_name in sorted(os.listdir(path)):
+                if file_name.endswith(".csv"):
+                    data = pd.read_csv(os.path.join(path, file_name), index_col='Date', parse_dates=True)
+                    series[file_name[:-4]] = data['Price']
+            prices = pd.DataFrame(series)
+        else:
+            prices = pd.read_csv(path, index_col='Date', parse_dates=True)
+        return cls(prices, **kwargs)
+
+    def save(self, path: str) -> None:
+        """Enregistre les prix dans un dossier (un CSV par ticker), relisible par from_path."""
+        os.makedirs(path, exist_ok=True)
+        for ticker in self.prices.columns:
+            self.prices[[ticker]].rename(columns={ticker: 'Price'}).dropna().to_csv(os.path.join(path, f"{ticker}.csv"))
+
+    # --- Horloge virtuelle et latence ---
+
+    def now(self) -> pd.Timestamp:
+        """Date virtuelle courante."""
+        elapsed = (time.monotonic() - self._clock_origin) * self.speed
+        return self.start + pd.Timedelta(seconds=elapsed)
+
+    def _simulate_latency(self) -> None:
+        if isinstance(self.latency, (tuple, list)):
+            with self._rng_lock:
+                delay = self._rng.uniform(*self.latency)
+        else:
+            delay = self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def _window(self, tickers, period: str) -> pd.DataFrame:
+        now = self.now()
+        end = self.prices.index.searchsorted(now, side='right')
+        if period == "max":
+            begin = 0
+        else:
+            begin = self.prices.index.searchsorted(now - PERIOD_OFFSETS[period], side='right')
+        return self.prices.iloc[begin:end][list(tickers)]
+
+    # --- Interface des data handlers ---
+
+    def get_historical_data(self, ticker: str, period: str = "6mo") -> pd.DataFrame:
+        """Équivalent de quant_a.data_handler.get_historical_data : DataFrame avec la colonne 'Price'."""
+        self._simulate_latency()
+        return self._window([ticker], period).rename(columns={ticker: 'Price'}).dropna()
+
+    def get_historical_data_multi(self, tickers, period: str = "1y") -> pd.DataFrame:
+        """Équivalent de quant_b.data_handler_b.get_historical_data_multi : une colonne par ticker."""
+        self._simulate_latency()
+        return self._window(tickers, period).dropna(how='all')
+
+    def get_realtime_quote(self, ticker: str):
+        """Dernier prix disponible à la date virtuelle courante (float), ou None."""
+        self._simulate_latency()
+        history = self._window([ticker], "5d")[ticker].dropna()
+        return float(history.iloc[-1]) if not history.empty else None
+
+    def get_realtime_prices_multi(self, tickers) -> dict:
+        """Équivalent de quant_b.data_handler_b.get_realtime_prices_multi (prix formatés)."""
+        prices = {}
+        for ticker in tickers:
+            price = self.get_realtime_quote(ticker)
+            prices[ticker] = f"{price:,.2f}" if price else "N/A"
+        return prices
+
+
+_ACTIVE_PROVIDER = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _parse_latency(value: str):
+    if not value:
+        return 0.0
+    bounds = [float(v) for v in value.split(",")]
+    return tuple(bounds) if len(bounds) == 2 else bounds[0]
+
+
+def get_replay_provider():
+    """
+    Retourne le fournisseur replay installé (set_replay_provider) ou configuré par les variables
+    d'environnement, ou None si QUANT_DATA_PROVIDER ne vaut pas 'replay' (les data handlers
+    utilisent alors yfinance).
+    """
+    global _ACTIVE_PROVIDER
+    if _ACTIVE_PROVIDER is not None:
+        return _ACTIVE_PROVIDER
+    if os.environ.get(PROVIDER_ENV, "").lower() != "replay":
+        return None
+
+    with _ACTIVE_LOCK:
+        if _ACTIVE_PROVIDER is None:
+            source = os.environ.get(SOURCE_ENV, "synthetic")
+            options = dict(
+                speed=float(os.environ.get(SPEED_ENV, 0.0)),
+                latency=_parse_latency(os.environ.get(LATENCY_ENV, "")),
+                start=os.environ.get(START_ENV) or None,
+            )
+            if source == "synthetic":
+                _ACTIVE_PROVIDER = ReplayDataProvider.synthetic(**options)
+            else:
+                _ACTIVE_PROVIDER = ReplayDataProvider.from_path(source, **options)
+        return _ACTIVE_PROVIDER
+
+
+def set_replay_provider(provider) -> None:
+    """Installe explicitement un fournisseur (None pour revenir à la configuration par environnement)."""
+    global _ACTIVE_PROVIDER
+    with _ACTIVE_LOCK:
+        _ACTIVE_PROVIDER = provider
+
+
+if __name__ == '__main__':
+    # Test du module : horloge accélérée (un jour de bourse par seconde réelle)
+    provider = ReplayDataProvider.synthetic(start=pd.Timestamp.today().normalize() - pd.Timedelta(days=30),
+                                            speed=86400, latency=(0.01, 0.05))
+    print(provider.get_historical_data("NVDA", period="1mo").tail(3))
+    time.sleep(2)
+    print(f"Date virtuelle : {provider.now()} / prix NVDA : {provider.get_realtime_quote('NVDA'):.2f}")
+    print(provider.get_realtime_prices_multi(["GOOGL", "AMZN", "JNJ"]))